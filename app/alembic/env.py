@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 from alembic import context
 from app.database.database import Base
-from app.models import user, wishlist, present
+from app.models import user, wishlist, present, outbox
 from app.config import settings
 
 
@@ -0,0 +1,40 @@
+"""add owner listing indexes
+
+Revision ID: 10c3797d4060
+Revises: 3858d0dca90d
+Create Date: 2026-01-12 11:04:37.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '10c3797d4060'
+down_revision: Union[str, Sequence[str], None] = '3858d0dca90d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_wishlists_user_id_created_at_id',
+        'wishlists',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_presents_wishlist_id_created_at_id',
+        'presents',
+        ['wishlist_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_presents_wishlist_id_created_at_id', table_name='presents')
+    op.drop_index('ix_wishlists_user_id_created_at_id', table_name='wishlists')
@@ -0,0 +1,57 @@
+"""include updated_at in listing indexes
+
+Revision ID: 3d534042eb4f
+Revises: b7c6c92b9b41
+Create Date: 2026-01-26 10:17:52.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d534042eb4f'
+down_revision: Union[str, Sequence[str], None] = 'b7c6c92b9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # count/max(updated_at) для ETag списков читаются index-only scan
+    op.drop_index('ix_wishlists_user_id_created_at_id', table_name='wishlists')
+    op.create_index(
+        'ix_wishlists_user_id_created_at_id',
+        'wishlists',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+        postgresql_include=['updated_at'],
+    )
+    op.drop_index('ix_presents_wishlist_id_created_at_id', table_name='presents')
+    op.create_index(
+        'ix_presents_wishlist_id_created_at_id',
+        'presents',
+        ['wishlist_id', 'created_at', 'id'],
+        unique=False,
+        postgresql_include=['updated_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_presents_wishlist_id_created_at_id', table_name='presents')
+    op.create_index(
+        'ix_presents_wishlist_id_created_at_id',
+        'presents',
+        ['wishlist_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.drop_index('ix_wishlists_user_id_created_at_id', table_name='wishlists')
+    op.create_index(
+        'ix_wishlists_user_id_created_at_id',
+        'wishlists',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+    )
@@ -0,0 +1,28 @@
+"""add present price index
+
+Revision ID: 5e2d8b1f4c73
+Revises: c41f0e7d9a26
+Create Date: 2026-02-18 15:22:47.903115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2d8b1f4c73'
+down_revision: Union[str, Sequence[str], None] = 'c41f0e7d9a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_presents_wishlist_id_price', 'presents', ['wishlist_id', 'price'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_presents_wishlist_id_price', table_name='presents')
@@ -0,0 +1,47 @@
+"""cascade foreign keys
+
+Revision ID: b7c6c92b9b41
+Revises: 10c3797d4060
+Create Date: 2026-01-19 15:42:08.136021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c6c92b9b41'
+down_revision: Union[str, Sequence[str], None] = '10c3797d4060'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Удаление одним DELETE ... RETURNING обходит ORM-каскад, поэтому каскад переносим в БД
+    op.drop_constraint('wishlists_user_id_fkey', 'wishlists', type_='foreignkey')
+    op.create_foreign_key(
+        'wishlists_user_id_fkey', 'wishlists', 'users',
+        ['user_id'], ['id'], ondelete='CASCADE',
+    )
+    op.drop_constraint('presents_wishlist_id_fkey', 'presents', type_='foreignkey')
+    op.create_foreign_key(
+        'presents_wishlist_id_fkey', 'presents', 'wishlists',
+        ['wishlist_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('presents_wishlist_id_fkey', 'presents', type_='foreignkey')
+    op.create_foreign_key(
+        'presents_wishlist_id_fkey', 'presents', 'wishlists',
+        ['wishlist_id'], ['id'],
+    )
+    op.drop_constraint('wishlists_user_id_fkey', 'wishlists', type_='foreignkey')
+    op.create_foreign_key(
+        'wishlists_user_id_fkey', 'wishlists', 'users',
+        ['user_id'], ['id'],
+    )
@@ -0,0 +1,53 @@
+"""add search indexes
+
+Revision ID: c41f0e7d9a26
+Revises: 892f69952339
+Create Date: 2026-02-16 11:04:12.318540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0e7d9a26'
+down_revision: Union[str, Sequence[str], None] = '892f69952339'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('presents', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(url, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.add_column('wishlists', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_presents_search_vector', 'presents', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_presents_name_trgm', 'presents', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_wishlists_search_vector', 'wishlists', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_wishlists_name_trgm', 'wishlists', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_wishlists_name_trgm', table_name='wishlists')
+    op.drop_index('ix_wishlists_search_vector', table_name='wishlists')
+    op.drop_index('ix_presents_name_trgm', table_name='presents')
+    op.drop_index('ix_presents_search_vector', table_name='presents')
+    op.drop_column('wishlists', 'search_vector')
+    op.drop_column('presents', 'search_vector')
@@ -9,7 +9,35 @@ class Settings(BaseSettings):
     algorithm: str = os.getenv("ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+    # Реплика для чтения; пусто — все запросы идут в database_url
+    database_read_url: str = os.getenv("DATABASE_READ_URL", "")
+    # Сколько секунд после записи чтения пользователя идут в primary
+    read_your_writes_seconds: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", 10))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    # Пересоздавать соединения старше N секунд; -1 — не пересоздавать
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    # Пинг перед каждой выдачей соединения стоит лишнего round-trip;
+    # при включённом recycle его обычно можно отключить
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("true", "1", "yes")
+
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    # Сколько ждать свободное соединение, когда пул исчерпан
+    redis_pool_timeout: float = float(os.getenv("REDIS_POOL_TIMEOUT", 2))
+    redis_socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+    redis_socket_connect_timeout: float = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", 2))
+    redis_health_check_interval: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("true", "1", "yes")
+    # Брать IP клиента из X-Forwarded-For (только за доверенным прокси)
+    rate_limit_trust_forwarded_for: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "false").lower() in ("true", "1", "yes")
+
+    response_cache_enabled: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+    response_cache_ttl_seconds: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 300))
+    response_cache_lock_ms: int = int(os.getenv("RESPONSE_CACHE_LOCK_MS", 2000))
 
     smtp_server: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     smtp_port: int = int(os.getenv("SMTP_PORT", 587))
@@ -18,6 +46,56 @@ class Settings(BaseSettings):
 
     smtp_from: str = os.getenv("SMTP_FROM", "noreply@yourapp.com")
     smtp_use_tls: bool = os.getenv("SMTP_USE_TLS", "true").lower() in ("true", "1", "yes")
+    smtp_pool_size: int = int(os.getenv("SMTP_POOL_SIZE", 2))
+    smtp_max_messages_per_connection: int = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", 100))
+    # Простаивавшее дольше N секунд соединение проверяется NOOP
+    smtp_idle_check_seconds: float = float(os.getenv("SMTP_IDLE_CHECK_SECONDS", 30))
+    # Письмо пишется в таблицу outbox в транзакции вишлиста и отправляется relay-процессом
+    email_use_outbox: bool = os.getenv("EMAIL_USE_OUTBOX", "true").lower() in ("true", "1", "yes")
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+    outbox_poll_interval_seconds: float = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", 1))
+    email_enqueue_timeout_seconds: float = float(os.getenv("EMAIL_ENQUEUE_TIMEOUT_SECONDS", 2))
+    # Ставить письмо в очередь после отправки ответа (BackgroundTasks)
+    email_enqueue_in_background: bool = os.getenv("EMAIL_ENQUEUE_IN_BACKGROUND", "true").lower() in ("true", "1", "yes")
+    email_batch_size: int = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+    email_status_ttl_seconds: int = int(os.getenv("EMAIL_STATUS_TTL_SECONDS", 3600 * 24))
+    # Страховка: если задача drain потерялась, следующее письмо запланирует новую
+    email_drain_schedule_ttl_seconds: int = int(os.getenv("EMAIL_DRAIN_SCHEDULE_TTL_SECONDS", 300))
+    # Бюджет одного drain; остаток буфера забирает следующая задача (таймаут задачи 120 с)
+    email_drain_max_seconds: int = int(os.getenv("EMAIL_DRAIN_MAX_SECONDS", 60))
+    # SimpleWorker не форкается на каждую задачу, поэтому SMTP-соединения переживают задачу
+    rq_worker_class: str = os.getenv("RQ_WORKER_CLASS", "rq.worker.SimpleWorker")
+
+    page_default_size: int = int(os.getenv("PAGE_DEFAULT_SIZE", 50))
+    page_max_size: int = int(os.getenv("PAGE_MAX_SIZE", 200))
+    export_chunk_size: int = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+    import_batch_size: int = int(os.getenv("IMPORT_BATCH_SIZE", 5000))
+    import_max_reported_errors: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 100))
+    present_batch_max_size: int = int(os.getenv("PRESENT_BATCH_MAX_SIZE", 500))
+
+    user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", 10000))
+    user_cache_ttl_seconds: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    jwt_cache_size: int = int(os.getenv("JWT_CACHE_SIZE", 10000))
+    jwt_cache_ttl_seconds: float = float(os.getenv("JWT_CACHE_TTL_SECONDS", 300))
+    # Доверять роли из токена и не ходить в БД за пользователем.
+    # Удалённый пользователь сохраняет доступ до истечения токена.
+    auth_trust_token_claims: bool = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() in ("true", "1", "yes")
+
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    # Сколько хэширований (выполняемых и ждущих в очереди) допускается, прежде чем отвечать 503
+    password_hash_max_pending: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+
+    # Параметры production-режима run.py --prod
+    server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_port: int = int(os.getenv("SERVER_PORT", 8000))
+    # 0 — по числу CPU
+    server_workers: int = int(os.getenv("SERVER_WORKERS", 0))
+    server_backlog: int = int(os.getenv("SERVER_BACKLOG", 2048))
+    server_keepalive_timeout: int = int(os.getenv("SERVER_KEEPALIVE_TIMEOUT", 5))
+    server_graceful_timeout: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+    # Перезапуск воркера после N запросов; 0 — без ограничения
+    server_limit_max_requests: int = int(os.getenv("SERVER_LIMIT_MAX_REQUESTS", 0))
 
     class Config:
         env_file = '.env'
@@ -1,8 +1,142 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, Tuple
 
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=[]
-)
+from fastapi import Request
+from redis.exceptions import RedisError
+from starlette.datastructures import MutableHeaders
 
+from app.config import settings
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# Token bucket: один вызов EVALSHA на запрос, время берётся из Redis,
+# поэтому все воркеры и хосты видят одни и те же счётчики.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_ms)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / refill_per_ms)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms))
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, limit: str, retry_after: float):
+        super().__init__(limit)
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    amount, _, period = rate.partition("/")
+    return int(amount), PERIODS[period.strip().rstrip("s")]
+
+
+def get_rate_limit_key(request: Request) -> str:
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is not None:
+        return f"user:{user_id}"
+    if settings.rate_limit_trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class Limiter:
+    def __init__(self, key_func: Callable[[Request], str], prefix: str = "ratelimit:"):
+        self.key_func = key_func
+        self.prefix = prefix
+        self._script = None
+
+    @property
+    def script(self):
+        # Кэшируется только sha скрипта; клиент берётся на каждый вызов из текущего пула,
+        # иначе после fork или сброса пулов скрипт ходил бы через пул родителя
+        if self._script is None:
+            self._script = get_async_redis().register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    async def hit(self, request: Request, scope: str, rate: str) -> None:
+        capacity, period = parse_rate(rate)
+        key = f"{self.prefix}{scope}:{self.key_func(request)}"
+        try:
+            allowed, remaining, retry_after_ms = await self.script(
+                keys=[key], args=[capacity, capacity / (period * 1000)], client=get_async_redis()
+            )
+        except (RedisError, OSError):
+            # Лимитер не должен ронять API, если Redis недоступен
+            logger.warning("Rate limiter недоступен, запрос пропущен без проверки", exc_info=True)
+            return
+
+        request.state.rate_limit = {
+            "limit": capacity,
+            "remaining": int(remaining),
+            # когда бакет снова наполнится целиком
+            "reset": int(time.time() + (capacity - int(remaining)) * period / capacity),
+        }
+        if not allowed:
+            raise RateLimitExceeded(rate, retry_after_ms / 1000)
+
+    def limit(self, rate: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any):
+                request = kwargs.get("request")
+                if request is None:
+                    request = next(arg for arg in args if isinstance(arg, Request))
+                if settings.rate_limit_enabled:
+                    await self.hit(request, scope, rate)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+class RateLimitHeadersMiddleware:
+    """Добавляет X-RateLimit-* к ответам роутов, прошедших через limiter."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Dict[str, Any]):
+            if message["type"] == "http.response.start":
+                info = scope.get("state", {}).get("rate_limit")
+                if info:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-RateLimit-Limit"] = str(info["limit"])
+                    headers["X-RateLimit-Remaining"] = str(info["remaining"])
+                    headers["X-RateLimit-Reset"] = str(info["reset"])
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+limiter = Limiter(key_func=get_rate_limit_key)
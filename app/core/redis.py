@@ -0,0 +1,59 @@
+import os
+from typing import Optional
+
+from redis import BlockingConnectionPool, Redis
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool, Redis as AsyncRedis
+
+from app.config import settings
+
+# Общие пулы соединений процесса: очередь RQ, статусы задач, кэш ответов и rate limiter.
+# Blocking-пулы при исчерпании ждут соединение до redis_pool_timeout, а не падают сразу:
+# иначе limiter на всплеске задержек Redis молча пропускал бы все запросы
+_pool: Optional[BlockingConnectionPool] = None
+_async_pool: Optional[AsyncBlockingConnectionPool] = None
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "max_connections": settings.redis_max_connections,
+        "timeout": settings.redis_pool_timeout,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+    }
+
+
+def get_redis_pool() -> BlockingConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = BlockingConnectionPool.from_url(settings.redis_url, **_pool_kwargs())
+    return _pool
+
+
+def get_async_redis_pool() -> AsyncBlockingConnectionPool:
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = AsyncBlockingConnectionPool.from_url(settings.redis_url, **_pool_kwargs())
+    return _async_pool
+
+
+def get_redis() -> Redis:
+    return Redis(connection_pool=get_redis_pool())
+
+
+def get_async_redis() -> AsyncRedis:
+    return AsyncRedis(connection_pool=get_async_redis_pool())
+
+
+def reset_redis_pools() -> None:
+    """Сбрасывает пулы в дочернем процессе после fork (RQ work horse, воркеры uvicorn).
+
+    Сокеты родителя не закрываем: они всё ещё принадлежат ему.
+    """
+    global _pool, _async_pool
+    _pool = None
+    _async_pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_redis_pools)
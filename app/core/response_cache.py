@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Надгробие в ключе версии: строка удалена, читатели отвечают 404 без БД
+VERSION_DELETED = "deleted"
+
+
+class VersionChanged(Exception):
+    """Loader прочитал строку новее версии из ключа: такое тело под этот ключ не кладём."""
+
+    def __init__(self, value: BaseModel, version: datetime):
+        super().__init__(version)
+        self.value = value
+        self.version = version
+
+
+class ResponseCache:
+    """Кэш сериализованных ответов в Redis с защитой от stampede.
+
+    Промах загружает значение только у одного процесса (SET NX lock),
+    остальные коротко ждут, пока оно появится в кэше.
+    При недоступном Redis запросы идут прямо в loader.
+    Ключи тел содержат версию строки (updated_at). Текущая версия лежит
+    в отдельном ключе, который каждая запись перезаписывает после коммита,
+    а удаление заменяет надгробием: попадание в кэш отдаёт ETag и тело без БД,
+    и новая версия никогда не получит старое тело.
+    """
+
+    def __init__(self, prefix: str = "cache:"):
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def redis(self) -> Redis:
+        return get_async_redis()
+
+    async def get_or_load(self, key: str, model: Type[M], loader: Callable[[], Awaitable[M]]) -> M:
+        if not settings.response_cache_enabled:
+            return await loader()
+
+        key = self.prefix + key
+        try:
+            cached = await self.redis.get(key)
+        except (RedisError, OSError):
+            self.errors += 1
+            logger.warning("Кэш ответов недоступен, читаем из БД", exc_info=True)
+            return await loader()
+
+        if cached is not None:
+            self.hits += 1
+            return model.model_validate_json(cached)
+
+        self.misses += 1
+        return await self._load(key, model, loader)
+
+    async def _load(self, key: str, model: Type[M], loader: Callable[[], Awaitable[M]]) -> M:
+        lock_key = key + ":lock"
+        try:
+            leader = await self.redis.set(lock_key, b"1", nx=True, px=settings.response_cache_lock_ms)
+            if not leader:
+                cached = await self._wait_for(key)
+                if cached is not None:
+                    return model.model_validate_json(cached)
+        except (RedisError, OSError):
+            self.errors += 1
+            return await loader()
+
+        try:
+            value = await loader()
+            try:
+                await self.redis.set(key, value.model_dump_json(), ex=settings.response_cache_ttl_seconds)
+            except (RedisError, OSError):
+                self.errors += 1
+            return value
+        finally:
+            if leader:
+                try:
+                    await self.redis.delete(lock_key)
+                except (RedisError, OSError):
+                    self.errors += 1
+
+    async def _wait_for(self, key: str) -> Optional[bytes]:
+        delay = 0.01
+        waited = 0.0
+        limit = settings.response_cache_lock_ms / 1000
+        while waited < limit:
+            await asyncio.sleep(delay)
+            waited += delay
+            cached = await self.redis.get(key)
+            if cached is not None:
+                return cached
+            delay = min(delay * 2, 0.2)
+        return None
+
+    async def get_version(self, key: str) -> Optional[str]:
+        """Текущая версия строки: isoformat updated_at, VERSION_DELETED или None, если неизвестна."""
+        if not settings.response_cache_enabled:
+            return None
+        try:
+            raw = await self.redis.get(self.prefix + key)
+        except (RedisError, OSError):
+            self.errors += 1
+            return None
+        return raw.decode() if raw is not None else None
+
+    async def set_versions(self, versions: Dict[str, datetime], only_if_absent: bool = False) -> None:
+        """Записи ставят версию безусловно; читатели из БД — только если ключа ещё нет (NX),
+        чтобы прочитанная с отстающей реплики версия не перетёрла свежую."""
+        await self._set_versions(
+            {key: version.isoformat() for key, version in versions.items()}, only_if_absent
+        )
+
+    async def mark_deleted(self, *keys: str) -> None:
+        await self._set_versions({key: VERSION_DELETED for key in keys}, only_if_absent=False)
+
+    async def _set_versions(self, values: Dict[str, str], only_if_absent: bool) -> None:
+        if not settings.response_cache_enabled or not values:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.set(self.prefix + key, value, ex=settings.response_cache_ttl_seconds, nx=only_if_absent)
+            await pipe.execute()
+        except (RedisError, OSError):
+            self.errors += 1
+            logger.warning("Не удалось обновить версии в кэше: %s", list(values), exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.response_cache_enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def wishlist_key(wishlist_id: int, updated_at: datetime) -> str:
+    return f"wishlist:{wishlist_id}:{updated_at.isoformat()}"
+
+
+def wishlist_version_key(wishlist_id: int) -> str:
+    return f"wishlist:{wishlist_id}:version"
+
+
+def present_key(present_id: int, updated_at: datetime) -> str:
+    return f"present:{present_id}:{updated_at.isoformat()}"
+
+
+def present_version_key(present_id: int) -> str:
+    return f"present:{present_id}:version"
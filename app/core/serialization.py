@@ -0,0 +1,28 @@
+from typing import Any, Iterable, List, Type, TypeVar
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def construct_rows(model: Type[M], rows: Iterable[Any]) -> List[M]:
+    """Строки select(...) по колонкам ответа -> модели без валидации: данные пришли из БД уже нужных типов."""
+    fields = tuple(model.model_fields)
+    fields_set = set(fields)
+    return [
+        model.model_construct(fields_set, **{name: getattr(row, name) for name in fields})
+        for row in rows
+    ]
+
+
+class ModelJSONResponse(JSONResponse):
+    """Сериализует модель скомпилированным сериализатором pydantic-core.
+
+    Если роутер возвращает Response, FastAPI не прогоняет результат повторно через response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
@@ -1,30 +1,59 @@
+from fastapi import Request
+from sqlalchemy import text
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from typing import AsyncGenerator
 
 from app.config import settings
+from app.database.pool import InstrumentedPool
 
 
-engine = create_async_engine(
-    settings.database_url,
-    future = True,
-    pool_pre_ping=True,
-)
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        future = True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+engine = _create_engine(settings.database_url)
+read_engine = _create_engine(settings.database_read_url) if settings.database_read_url else engine
 
 AsyncSessionLocal = sessionmaker(
     engine, class_= AsyncSession, expire_on_commit=False
 )
+AsyncReadSessionLocal = sessionmaker(
+    read_engine, class_= AsyncSession, expire_on_commit=False
+)
 
 Base = declarative_base()
 
-async def get_db() -> AsyncGenerator[AsyncSession | None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession | None]:
+    # Одна сессия на запрос: get_current_user и роут получают один и тот же объект
+    session = getattr(request.state, "db_session", None)
+    if session is not None:
+        yield session
+        return
     async with AsyncSessionLocal() as session:
+        request.state.db_session = session
         try:
             yield session
         finally:
+            request.state.db_session = None
             await session.close()
 
+def pool_stats() -> dict:
+    stats = {"primary": engine.sync_engine.pool.stats()}
+    if read_engine is not engine:
+        stats["replica"] = read_engine.sync_engine.pool.stats()
+    return stats
+
 async def init_db():
     async with engine.begin() as conn:
+        # gin_trgm_ops для индексов поиска
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
-
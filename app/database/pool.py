@@ -0,0 +1,64 @@
+import bisect
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """Счётчики ожидания соединений из пула; гистограмма в секундах."""
+
+    buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self):
+        self.waiters = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_histogram: List[int] = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_histogram[bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        histogram = {f"le_{bound}": count for bound, count in zip(self.buckets, self.wait_histogram)}
+        histogram["le_inf"] = self.wait_histogram[-1]
+        return {
+            "waiters": self.waiters,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_histogram": histogram,
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, который замеряет время ожидания свободного соединения."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        self.metrics.waiters += 1
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.waiters -= 1
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            **self.metrics.snapshot(),
+        }
@@ -0,0 +1,61 @@
+import time
+from typing import AsyncGenerator
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.database.database import AsyncReadSessionLocal, engine, get_db, read_engine
+from app.schemas.user import CurrentUser
+from app.security.dependencies import get_current_user
+
+STICKY_COOKIE = "read_primary_until"
+
+# id пользователя -> отметка о недавней записи; cookie нужна, когда
+# следующий запрос попадает в другой процесс uvicorn
+recent_writers = TTLCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.read_your_writes_seconds,
+)
+
+
+def mark_write(user_id: int) -> None:
+    recent_writers.set(user_id, True)
+
+
+def is_sticky(request: Request, user_id: int) -> bool:
+    if recent_writers.get(user_id):
+        return True
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(
+    request: Request,
+    primary: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession]:
+    if read_engine is engine or is_sticky(request, current_user.id):
+        yield primary
+        return
+    async with AsyncReadSessionLocal() as session:
+        yield session
+
+
+async def get_write_db(
+    response: Response,
+    session: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> AsyncSession:
+    if read_engine is not engine:
+        mark_write(current_user.id)
+        response.set_cookie(
+            STICKY_COOKIE,
+            str(time.time() + settings.read_your_writes_seconds),
+            max_age=int(settings.read_your_writes_seconds) + 1,
+            httponly=True,
+        )
+    return session
@@ -1,15 +1,21 @@
+import math
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.errors import RateLimitExceeded
 
 from app.routers.wishlist import router as wishlist_router
 from app.routers.present import router as present_router
 from app.routers.user import router as user_router
-from app.database.database import init_db
+from app.routers.export import router as export_router
+from app.routers.search import router as search_router
+from app.database.database import init_db, pool_stats
+from app.core.response_cache import response_cache
 from app.config import settings
-from app.core.limit import limiter
+from app.core.limit import RateLimitExceeded, RateLimitHeadersMiddleware
+from app.security.user_cache import user_cache
+from app.security.jwt import token_cache
+from app.security.password import password_pool_stats
+from app.tasks.outbox_relay import get_outbox_lag
 
 
 app = FastAPI(
@@ -18,8 +24,7 @@ app = FastAPI(
     redoc_url='/api/redoc',
 )
 
-app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(RateLimitHeadersMiddleware)
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
@@ -28,12 +33,15 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         content={
             "error": "RATE_LIMIT_EXCEEDED",
             "message": "Too many requests, slow down"
-        }
+        },
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
     )
 
 app.include_router(wishlist_router)
 app.include_router(present_router)
 app.include_router(user_router)
+app.include_router(export_router)
+app.include_router(search_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -57,3 +65,14 @@ async def root():
 @app.get('/health')
 async def health_check():
     return {'status':'healthy'}
+
+@app.get('/metrics')
+async def metrics():
+    return {
+        'user_cache': user_cache.stats(),
+        'token_cache': token_cache.stats(),
+        'password_pool': password_pool_stats(),
+        'db_pool': pool_stats(),
+        'response_cache': response_cache.stats(),
+        'outbox': await get_outbox_lag(),
+    }
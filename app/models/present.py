@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Integer, String, Date, DateTime, ForeignKey, Numeric, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 
 from app.database.database import Base
 
 class Present(Base):
     __tablename__ = 'presents'
+    __table_args__ = (
+        Index('ix_presents_wishlist_id_created_at_id', 'wishlist_id', 'created_at', 'id', postgresql_include=['updated_at']),
+        Index('ix_presents_wishlist_id_price', 'wishlist_id', 'price'),
+        Index('ix_presents_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_presents_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, index=True, nullable = False)
@@ -14,7 +21,15 @@ class Present(Base):
     description = Column(String, nullable = True)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
-    wishlist_id = Column(Integer, ForeignKey('wishlists.id'), nullable=False)
+    wishlist_id = Column(Integer, ForeignKey('wishlists.id', ondelete='CASCADE'), nullable=False)
+    # Генерируемая колонка для полнотекстового поиска; 'simple' — без стемминга, тексты смешанные ru/en
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(url, ''))",
+            persisted=True,
+        ),
+    ))
 
 
     wishlist = relationship("Wishlist", back_populates="presents")
@@ -20,4 +20,4 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
     role = Column(Enum(RoleEnum), default=RoleEnum.USER)
 
-    wishlists = relationship("Wishlist", back_populates="owner", cascade="all, delete-orphan")
+    wishlists = relationship("Wishlist", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Computed, Integer, String, Date, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.database.database import Base
 
 class Wishlist(Base):
     __tablename__ = 'wishlists'
+    __table_args__ = (
+        Index('ix_wishlists_user_id_created_at_id', 'user_id', 'created_at', 'id', postgresql_include=['updated_at']),
+        Index('ix_wishlists_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_wishlists_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable = False)
@@ -13,7 +19,11 @@ class Wishlist(Base):
     event_date = Column(Date, nullable=True)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))", persisted=True),
+    ))
 
-    presents = relationship("Present", back_populates="wishlist", cascade="all, delete-orphan")
+    presents = relationship("Present", back_populates="wishlist", cascade="all, delete-orphan", passive_deletes=True)
     owner = relationship("User", back_populates="wishlists")
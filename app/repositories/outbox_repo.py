@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, select
+
+from app.models.outbox import OutboxMessage
+
+WELCOME_EMAIL_TOPIC = "welcome_email"
+
+class OutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_message(self, topic: str, payload: Dict[str, Any]) -> None:
+        # Без commit: сообщение фиксируется в той же транзакции, что и доменная запись
+        await self.session.execute(
+            insert(OutboxMessage).values(topic=topic, payload=payload)
+        )
+
+    async def claim_batch(self, limit: int) -> List[OutboxMessage]:
+        # SKIP LOCKED: несколько relay-процессов разбирают разные строки
+        result = await self.session.execute(
+            select(OutboxMessage)
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def delete_messages(self, message_ids: List[int]) -> None:
+        await self.session.execute(
+            delete(OutboxMessage).where(OutboxMessage.id.in_(message_ids))
+        )
+
+    async def get_lag(self) -> Tuple[int, Optional[datetime]]:
+        result = await self.session.execute(
+            select(func.count(OutboxMessage.id), func.min(OutboxMessage.created_at))
+        )
+        count, oldest = result.one()
+        return count, oldest
@@ -1,8 +1,35 @@
-from typing import Optional, List, Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy import Boolean, Float, Integer, case, cast, column, delete, func, insert, or_, text, tuple_, update, values
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.future import select
 
 from app.models.present import Present
+from app.models.wishlist import Wishlist
+from app.core.pagination import Cursor
+from app.schemas.present import PresentFilter
+
+# Колонки ответа списков: строки вместо ORM-объектов, price сразу float
+LIST_COLUMNS = (
+    Present.id,
+    Present.url,
+    Present.name,
+    cast(Present.price, Float).label("price"),
+    Present.description,
+    Present.wishlist_id,
+    Present.created_at,
+)
+
+# Поля, которые можно менять пакетным обновлением
+BATCH_UPDATE_COLUMNS = ("url", "name", "price", "description", "wishlist_id")
+
+def _owned_wishlist_ids(user_id: int):
+    return select(Wishlist.id).where(Wishlist.user_id == user_id)
+
+def _db_error_detail(error: DBAPIError) -> str:
+    # Первая строка сообщения драйвера, без DETAIL/SQL
+    return str(error.orig).splitlines()[0] if error.orig is not None else "Database error"
 
 class PresentRepository:
     def __init__(self, session: AsyncSession):
@@ -14,31 +41,261 @@ class PresentRepository:
         )
         return result.scalars().first()
 
-    async def get_all_presents(self) -> List[Present]:
-        result = await self.session.execute(select(Present))
+    async def get_present_version(self, present_id: int) -> Optional[datetime]:
+        result = await self.session.execute(
+            select(Present.updated_at).where(Present.id == present_id)
+        )
+        return result.scalars().first()
+
+    async def get_presents_version(
+        self, user_id: Optional[int] = None, wishlist_id: Optional[int] = None
+    ) -> Tuple[int, Optional[datetime]]:
+        query = select(func.count(Present.id), func.max(Present.updated_at))
+        if user_id is not None:
+            query = query.join(Wishlist, Present.wishlist_id == Wishlist.id).where(Wishlist.user_id == user_id)
+        if wishlist_id is not None:
+            query = query.where(Present.wishlist_id == wishlist_id)
+        result = await self.session.execute(query)
+        count, last_updated = result.one()
+        return count, last_updated
+
+    @staticmethod
+    def _apply_filter(query, after: Optional[Cursor], filters: Optional[PresentFilter]):
+        filters = filters or PresentFilter()
+        if filters.min_price is not None:
+            query = query.where(Present.price >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.where(Present.price <= filters.max_price)
+        if filters.order == "desc":
+            query = query.order_by(Present.created_at.desc(), Present.id.desc())
+            if after is not None:
+                query = query.where(tuple_(Present.created_at, Present.id) < after)
+        else:
+            query = query.order_by(Present.created_at, Present.id)
+            if after is not None:
+                query = query.where(tuple_(Present.created_at, Present.id) > after)
+        return query
+
+    async def get_all_presents(
+        self,
+        limit: int,
+        after: Optional[Cursor] = None,
+        user_id: Optional[int] = None,
+        filters: Optional[PresentFilter] = None,
+    ) -> List[Any]:
+        query = select(*LIST_COLUMNS).limit(limit)
+        if user_id is not None:
+            query = query.join(Wishlist, Present.wishlist_id == Wishlist.id).where(Wishlist.user_id == user_id)
+        query = self._apply_filter(query, after, filters)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_presents_by_wishlist(
+        self,
+        wishlist_id: int,
+        limit: int,
+        after: Optional[Cursor] = None,
+        filters: Optional[PresentFilter] = None,
+    ) -> List[Any]:
+        query = select(*LIST_COLUMNS).where(Present.wishlist_id == wishlist_id).limit(limit)
+        query = self._apply_filter(query, after, filters)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_price_stats(self, wishlist_id: int) -> Tuple[int, int, Any, Any, Any]:
+        """count, priced_count, sum, min, max по вишлисту одним агрегатом (индекс wishlist_id, price)."""
+        result = await self.session.execute(
+            select(
+                func.count(Present.id),
+                func.count(Present.price),
+                func.coalesce(func.sum(Present.price), 0),
+                func.min(Present.price),
+                func.max(Present.price),
+            ).where(Present.wishlist_id == wishlist_id)
+        )
+        return tuple(result.one())
+
+    async def get_present_ids_by_wishlist(self, wishlist_id: int) -> List[int]:
+        result = await self.session.execute(
+            select(Present.id).where(Present.wishlist_id == wishlist_id)
+        )
         return result.scalars().all()
 
     async def create_present(self, data: Dict[str, Any]) -> Present:
-        new_present = Present(**data)
-        self.session.add(new_present)
+        result = await self.session.execute(
+            insert(Present).values(**data).returning(Present)
+        )
+        new_present = result.scalars().one()
         await self.session.commit()
-        await self.session.refresh(new_present)
         return new_present
 
     async def update_present(self, present_id: int, data: Dict[str, Any]) -> Optional[Present]:
-        present = await self.get_present_by_id(present_id)
-        if not present:
-            return None
-        for key, value in data.items():
-            setattr(present, key, value)
+        if not data:
+            return await self.get_present_by_id(present_id)
+        result = await self.session.execute(
+            update(Present).where(Present.id == present_id).values(**data).returning(Present)
+        )
+        present = result.scalars().first()
         await self.session.commit()
-        await self.session.refresh(present)
         return present
 
     async def delete_present(self, present_id: int) -> bool:
-        present = await self.get_present_by_id(present_id)
-        if not present:
-            return False
-        await self.session.delete(present)
+        result = await self.session.execute(
+            delete(Present).where(Present.id == present_id).returning(Present.id)
+        )
+        deleted = result.scalars().first() is not None
+        await self.session.commit()
+        return deleted
+
+    async def create_presents(self, rows: List[Dict[str, Any]]) -> List[Tuple[Optional[Present], Optional[str]]]:
+        """Возвращает (present, ошибка) на каждую строку.
+
+        Пакет вставляется одним INSERT в savepoint; если БД его отвергла,
+        строки вставляются по одной, каждая в своём savepoint, чтобы найти виноватые.
+        """
+        if not rows:
+            return []
+        try:
+            async with self.session.begin_nested():
+                result = await self.session.scalars(
+                    insert(Present).returning(Present, sort_by_parameter_order=True),
+                    rows,
+                )
+                outcomes = [(present, None) for present in result.all()]
+        except DBAPIError:
+            outcomes = []
+            for row in rows:
+                try:
+                    async with self.session.begin_nested():
+                        result = await self.session.execute(insert(Present).values(**row).returning(Present))
+                        outcomes.append((result.scalars().one(), None))
+                except DBAPIError as e:
+                    outcomes.append((None, _db_error_detail(e)))
+        await self.session.commit()
+        return outcomes
+
+    async def update_presents(
+        self, rows: List[Dict[str, Any]], user_id: int
+    ) -> List[Tuple[Optional[Present], Optional[str]]]:
+        """Каждая строка содержит id и изменяемые поля; обновляются только подарки из вишлистов user_id.
+
+        Возвращает (present, ошибка) на каждую строку; (None, None) — подарок не найден или чужой.
+        Пакет идёт одним UPDATE ... FROM (VALUES ...) в savepoint; если БД его отвергла,
+        строки обновляются по одной, каждая в своём savepoint, чтобы найти виноватые.
+        """
+        if not rows:
+            return []
+        try:
+            async with self.session.begin_nested():
+                result = await self.session.execute(self._batch_update(rows, user_id))
+                updated = {present.id: present for present in result.scalars().all()}
+            outcomes = [(updated.get(row["id"]), None) for row in rows]
+        except DBAPIError:
+            outcomes = []
+            for row in rows:
+                try:
+                    async with self.session.begin_nested():
+                        result = await self.session.execute(self._batch_update([row], user_id))
+                        outcomes.append((result.scalars().first(), None))
+                except DBAPIError as e:
+                    outcomes.append((None, _db_error_detail(e)))
+        await self.session.commit()
+        return outcomes
+
+    @staticmethod
+    def _batch_update(rows: List[Dict[str, Any]], user_id: int):
+        # У строк разный набор полей: флаг <поле>_set говорит, брать ли значение из VALUES или оставить текущее
+        batch = values(
+            column("id", Integer),
+            *(column(name, Present.__table__.c[name].type) for name in BATCH_UPDATE_COLUMNS),
+            *(column(f"{name}_set", Boolean) for name in BATCH_UPDATE_COLUMNS),
+            name="batch",
+        ).data([
+            (
+                row["id"],
+                *(row.get(name) for name in BATCH_UPDATE_COLUMNS),
+                *(name in row for name in BATCH_UPDATE_COLUMNS),
+            )
+            for row in rows
+        ])
+        changed = or_(*(batch.c[f"{name}_set"] for name in BATCH_UPDATE_COLUMNS))
+        return (
+            update(Present)
+            .where(Present.id == batch.c.id, Present.wishlist_id.in_(_owned_wishlist_ids(user_id)))
+            .values(
+                **{
+                    name: case((batch.c[f"{name}_set"], batch.c[name]), else_=getattr(Present, name))
+                    for name in BATCH_UPDATE_COLUMNS
+                },
+                # Строка без полей возвращается как есть, не сдвигая версию
+                updated_at=case((changed, datetime.now()), else_=Present.updated_at),
+            )
+            .returning(Present)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def delete_presents(self, present_ids: List[int], user_id: int) -> List[int]:
+        if not present_ids:
+            return []
+        result = await self.session.execute(
+            delete(Present)
+            .where(Present.id.in_(present_ids), Present.wishlist_id.in_(_owned_wishlist_ids(user_id)))
+            .returning(Present.id)
+        )
+        deleted = result.scalars().all()
+        await self.session.commit()
+        return deleted
+
+    async def stream_presents(self, user_id: int, chunk_size: int) -> AsyncResult:
+        return await self.session.stream(
+            select(
+                Present.id,
+                Present.wishlist_id,
+                Present.name,
+                Present.url,
+                Present.price,
+                Present.description,
+                Present.created_at,
+                Present.updated_at,
+            )
+            .join(Wishlist, Present.wishlist_id == Wishlist.id)
+            .where(Wishlist.user_id == user_id)
+            .order_by(Present.id)
+            .execution_options(yield_per=chunk_size)
+        )
+
+    async def create_import_staging(self) -> None:
+        await self.session.execute(text(
+            "CREATE TEMP TABLE present_import ("
+            " url varchar NOT NULL, name varchar NOT NULL,"
+            " price numeric(10, 2), description varchar"
+            ") ON COMMIT DROP"
+        ))
+
+    async def copy_to_staging(self, records: List[Tuple[Any, ...]]) -> None:
+        # COPY идёт через asyncpg-соединение текущей транзакции сессии
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "present_import",
+            records=records,
+            columns=["url", "name", "price", "description"],
+        )
+
+    async def merge_staging(self, wishlist_id: int) -> int:
+        """Переносит staging в presents без дублей по url внутри вишлиста."""
+        result = await self.session.execute(
+            text(
+                "INSERT INTO presents (url, name, price, description, wishlist_id, created_at, updated_at) "
+                "SELECT DISTINCT ON (s.url) s.url, s.name, s.price, s.description, :wishlist_id, :now, :now "
+                "FROM present_import s "
+                "WHERE NOT EXISTS ("
+                " SELECT 1 FROM presents p WHERE p.wishlist_id = :wishlist_id AND p.url = s.url"
+                ") "
+                "ORDER BY s.url"
+            ),
+            # Время ставит приложение, как и в остальных записях (datetime.now), а не часы БД
+            {"wishlist_id": wishlist_id, "now": datetime.now()},
+        )
         await self.session.commit()
-        return True
+        return result.rowcount
@@ -0,0 +1,77 @@
+from typing import Any, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, String, and_, func, literal, or_, tuple_, union_all
+from sqlalchemy.future import select
+
+from app.models.present import Present
+from app.models.wishlist import Wishlist
+from app.core.pagination import SearchCursor
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SearchRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(
+        self, user_id: int, query: str, limit: int, after: Optional[SearchCursor] = None
+    ) -> List[Any]:
+        """Поиск по своим подаркам и вишлистам.
+
+        Совпадение — tsvector (GIN), триграммная похожесть или подстрока в name
+        (оба через GIN gin_trgm_ops). Ранг — ts_rank + similarity,
+        keyset-пагинация по (rank desc, kind, id).
+        """
+        ts_query = func.websearch_to_tsquery("simple", query)
+        pattern = _like_pattern(query)
+
+        presents = (
+            select(
+                literal("present", String).label("kind"),
+                Present.id,
+                Present.name,
+                Present.description,
+                Present.url,
+                Present.wishlist_id,
+                (func.ts_rank(Present.search_vector, ts_query) + func.similarity(Present.name, query)).label("rank"),
+            )
+            .join(Wishlist, Present.wishlist_id == Wishlist.id)
+            .where(Wishlist.user_id == user_id)
+            .where(or_(
+                Present.search_vector.op("@@")(ts_query),
+                Present.name.op("%")(query),
+                Present.name.ilike(pattern, escape="\\"),
+            ))
+        )
+        wishlists = (
+            select(
+                literal("wishlist", String).label("kind"),
+                Wishlist.id,
+                Wishlist.name,
+                Wishlist.description,
+                literal(None, String).label("url"),
+                literal(None, Integer).label("wishlist_id"),
+                (func.ts_rank(Wishlist.search_vector, ts_query) + func.similarity(Wishlist.name, query)).label("rank"),
+            )
+            .where(Wishlist.user_id == user_id)
+            .where(or_(
+                Wishlist.search_vector.op("@@")(ts_query),
+                Wishlist.name.op("%")(query),
+                Wishlist.name.ilike(pattern, escape="\\"),
+            ))
+        )
+        hits = union_all(presents, wishlists).subquery()
+
+        stmt = select(hits).order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id).limit(limit)
+        if after is not None:
+            rank, kind, row_id = after
+            stmt = stmt.where(or_(
+                hits.c.rank < rank,
+                and_(hits.c.rank == rank, tuple_(hits.c.kind, hits.c.id) > (kind, row_id)),
+            ))
+        result = await self.session.execute(stmt)
+        return result.all()
@@ -1,8 +1,10 @@
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, tuple_, update
 
 from app.models.user import User
+from app.core.pagination import Cursor
+from app.security.user_cache import invalidate_user
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
@@ -14,34 +16,40 @@ class UserRepository:
         )
         return result.scalars().first()
 
-    async def get_all_users(self) -> List[User]:
-        result = await self.session.execute(select(User))
+    async def get_all_users(self, limit: int, after: Optional[Cursor] = None) -> List[User]:
+        query = select(User).order_by(User.created_at, User.id).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(User.created_at, User.id) > after)
+        result = await self.session.execute(query)
         return result.scalars().all()
 
     async def create_user(self, data: Dict[str, Any]) -> User:
-        new_user = User(**data)
-        self.session.add(new_user)
+        result = await self.session.execute(
+            insert(User).values(**data).returning(User)
+        )
+        new_user = result.scalars().one()
         await self.session.commit()
-        await self.session.refresh(new_user)
         return new_user
 
     async def update_user(self, user_id: int, data: Dict[str, Any]) -> Optional[User]:
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            return None
-        for key, value in data.items():
-            setattr(user, key, value)
+        if not data:
+            return await self.get_user_by_id(user_id)
+        result = await self.session.execute(
+            update(User).where(User.id == user_id).values(**data).returning(User)
+        )
+        user = result.scalars().first()
         await self.session.commit()
-        await self.session.refresh(user)
+        invalidate_user(user_id)
         return user
 
     async def delete_user(self, user_id: int) -> bool:
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            return False
-        await self.session.delete(user)
+        result = await self.session.execute(
+            delete(User).where(User.id == user_id).returning(User.id)
+        )
+        deleted = result.scalars().first() is not None
         await self.session.commit()
-        return True
+        invalidate_user(user_id)
+        return deleted
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         result = await self.session.execute(
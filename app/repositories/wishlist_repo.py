@@ -1,8 +1,22 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy import delete, func, insert, tuple_, update
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
 
+from app.models.present import Present
 from app.models.wishlist import Wishlist
+from app.core.pagination import Cursor
+
+LIST_COLUMNS = (
+    Wishlist.id,
+    Wishlist.name,
+    Wishlist.description,
+    Wishlist.event_date,
+    Wishlist.user_id,
+    Wishlist.created_at,
+)
 
 class WishlistRepository:
     def __init__(self, session: AsyncSession):
@@ -14,31 +28,98 @@ class WishlistRepository:
         )
         return result.scalars().first()
 
-    async def get_all_wishlists(self) -> List[Wishlist]:
-        result = await self.session.execute(select(Wishlist))
-        return result.scalars().all()
+    async def get_wishlist_with_presents(self, wishlist_id: int) -> Optional[Wishlist]:
+        # joinedload: вишлист и подарки одним запросом, без ленивой загрузки в AsyncSession
+        result = await self.session.execute(
+            select(Wishlist)
+            .options(joinedload(Wishlist.presents))
+            .where(Wishlist.id == wishlist_id)
+        )
+        return result.unique().scalars().first()
+
+    async def get_wishlist_version(self, wishlist_id: int) -> Optional[datetime]:
+        result = await self.session.execute(
+            select(Wishlist.updated_at).where(Wishlist.id == wishlist_id)
+        )
+        return result.scalars().first()
+
+    async def get_wishlist_detail_version(self, wishlist_id: int) -> Optional[Tuple[datetime, int, Optional[datetime]]]:
+        """(updated_at вишлиста, число подарков, max updated_at подарков) одним запросом; None — вишлиста нет."""
+        result = await self.session.execute(
+            select(Wishlist.updated_at, func.count(Present.id), func.max(Present.updated_at))
+            .outerjoin(Present, Present.wishlist_id == Wishlist.id)
+            .where(Wishlist.id == wishlist_id)
+            .group_by(Wishlist.id)
+        )
+        return result.first()
+
+    async def get_wishlists_version(self, user_id: Optional[int] = None) -> Tuple[int, Optional[datetime]]:
+        query = select(func.count(Wishlist.id), func.max(Wishlist.updated_at))
+        if user_id is not None:
+            query = query.where(Wishlist.user_id == user_id)
+        result = await self.session.execute(query)
+        count, last_updated = result.one()
+        return count, last_updated
+
+    async def get_existing_ids(self, wishlist_ids: Iterable[int], user_id: int) -> Set[int]:
+        """Из переданных id — те, что существуют и принадлежат пользователю."""
+        ids = set(wishlist_ids)
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(Wishlist.id).where(Wishlist.id.in_(ids), Wishlist.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
+    async def get_all_wishlists(
+        self, limit: int, after: Optional[Cursor] = None, user_id: Optional[int] = None
+    ) -> List[Any]:
+        query = select(*LIST_COLUMNS).order_by(Wishlist.created_at, Wishlist.id).limit(limit)
+        if user_id is not None:
+            query = query.where(Wishlist.user_id == user_id)
+        if after is not None:
+            query = query.where(tuple_(Wishlist.created_at, Wishlist.id) > after)
+        result = await self.session.execute(query)
+        return result.all()
 
     async def create_wishlist(self, data: Dict[str, Any]) -> Wishlist:
-        new_wishlist = Wishlist(**data)
-        self.session.add(new_wishlist)
+        result = await self.session.execute(
+            insert(Wishlist).values(**data).returning(Wishlist)
+        )
+        new_wishlist = result.scalars().one()
         await self.session.commit()
-        await self.session.refresh(new_wishlist)
         return new_wishlist
 
     async def update_wishlist(self, wishlist_id: int, data: Dict[str, Any]) -> Optional[Wishlist]:
-        wishlist = await self.get_wishlist_by_id(wishlist_id)
-        if not wishlist:
-            return None
-        for key, value in data.items():
-            setattr(wishlist, key, value)
+        if not data:
+            return await self.get_wishlist_by_id(wishlist_id)
+        result = await self.session.execute(
+            update(Wishlist).where(Wishlist.id == wishlist_id).values(**data).returning(Wishlist)
+        )
+        wishlist = result.scalars().first()
         await self.session.commit()
-        await self.session.refresh(wishlist)
         return wishlist
 
     async def delete_wishlist(self, wishlist_id: int) -> bool:
-        wishlist = await self.get_wishlist_by_id(wishlist_id)
-        if not wishlist:
-            return False
-        await self.session.delete(wishlist)
+        result = await self.session.execute(
+            delete(Wishlist).where(Wishlist.id == wishlist_id).returning(Wishlist.id)
+        )
+        deleted = result.scalars().first() is not None
         await self.session.commit()
-        return True
+        return deleted
+
+    async def stream_wishlists(self, user_id: int, chunk_size: int) -> AsyncResult:
+        # Серверный курсор: строки приходят пачками по chunk_size
+        return await self.session.stream(
+            select(
+                Wishlist.id,
+                Wishlist.name,
+                Wishlist.description,
+                Wishlist.event_date,
+                Wishlist.created_at,
+                Wishlist.updated_at,
+            )
+            .where(Wishlist.user_id == user_id)
+            .order_by(Wishlist.id)
+            .execution_options(yield_per=chunk_size)
+        )
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from typing import Literal
+
+from app.services.export import ExportService
+from app.security.dependencies import get_current_user, require_user_role
+from app.models.user import User
+from app.core.limit import limiter
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["export"]
+)
+
+@router.get("/")
+@limiter.limit("2/minute")
+async def export_data(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    export_service = ExportService(current_user.id)
+    if format == "csv":
+        return StreamingResponse(
+            export_service.stream_csv(),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="wishlist-export.csv"'},
+        )
+    return StreamingResponse(
+        export_service.stream_ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="wishlist-export.ndjson"'},
+    )
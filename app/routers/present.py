@@ -1,45 +1,116 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, Query, status, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal, Optional
 
-from app.database.database import get_db
+from app.database.routing import get_read_db, get_write_db
 from app.services.present import PresentService
-from app.schemas.present import PresentResponse, PresentCreate, PresentUpdate
+from app.schemas.present import (
+    PresentResponse,
+    PresentPage,
+    PresentFilter,
+    PresentCreate,
+    PresentUpdate,
+    PresentBatchCreate,
+    PresentBatchUpdate,
+    PresentBatchDelete,
+    PresentBatchResponse,
+    PresentBatchDeleteResponse,
+)
 from app.security.dependencies import get_current_user, require_user_role
 from app.models.user import User
 from app.core.limit import limiter
+from app.core.etag import etag_matches, not_modified
+from app.core.serialization import ModelJSONResponse
+from app.config import settings
 
 router = APIRouter(
     prefix="/api/present",
     tags=["present"]
 )
 
-@router.get("/", response_model=List[PresentResponse], status_code=status.HTTP_200_OK)
+@router.get("/", response_model=PresentPage, status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute")
+async def get_presents(
+    request: Request,
+    limit: int = Query(settings.page_default_size, ge=1, le=settings.page_max_size),
+    cursor: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    order: Literal["asc", "desc"] = "asc",
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    filters = PresentFilter(min_price=min_price, max_price=max_price, order=order)
+    present_service = PresentService(db)
+    etag = await present_service.get_presents_etag(user_id=current_user.id, limit=limit, cursor=cursor, filters=filters)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    page = await present_service.get_presents(current_user.id, limit, cursor, filters)
+    return ModelJSONResponse(page, headers={"ETag": etag})
+
+@router.post("/batch", response_model=PresentBatchResponse, status_code=status.HTTP_201_CREATED)
+@limiter.limit("5/minute")
+async def create_presents(
+    request: Request,
+    batch: PresentBatchCreate,
+    db: Session = Depends(get_write_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    present_service = PresentService(db)
+    return await present_service.create_presents(batch, current_user.id)
+
+@router.put("/batch", response_model=PresentBatchResponse, status_code=status.HTTP_200_OK)
+@limiter.limit("5/minute")
+async def update_presents(
+    request: Request,
+    batch: PresentBatchUpdate,
+    db: Session = Depends(get_write_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    present_service = PresentService(db)
+    return await present_service.update_presents(batch, current_user.id)
+
+@router.delete("/batch", response_model=PresentBatchDeleteResponse, status_code=status.HTTP_200_OK)
 @limiter.limit("10/minute")
-async def get_presents(request: Request,db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def delete_presents(
+    request: Request,
+    batch: PresentBatchDelete,
+    db: Session = Depends(get_write_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
     present_service = PresentService(db)
-    return await present_service.get_presents()
+    return await present_service.delete_presents(batch, current_user.id)
 
 @router.get("/{present_id}", response_model=PresentResponse, status_code=status.HTTP_200_OK)
 @limiter.limit("10/minute")
-async def get_present(request: Request,present_id: int, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def get_present(request: Request,response: Response,present_id: int, db:Session = Depends(get_read_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     present_service = PresentService(db)
-    return await present_service.get_present_by_id(present_id)
+    updated_at = await present_service.get_present_version(present_id)
+    etag = present_service.present_etag(present_id, updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    etag, present = await present_service.get_present_by_id(present_id, updated_at)
+    response.headers["ETag"] = etag
+    return present
 
 @router.post("/", response_model = PresentResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
-async def create_present(request: Request,present: PresentCreate, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def create_present(request: Request,present: PresentCreate, db:Session = Depends(get_write_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     present_service = PresentService(db)
     return await present_service.create_present(present)
 
 @router.put("/{present_id}", response_model=PresentResponse, status_code=status.HTTP_200_OK)
 @limiter.limit("5/minute")
-async def update_present(request: Request,present_id: int, present: PresentUpdate, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def update_present(request: Request,present_id: int, present: PresentUpdate, db:Session = Depends(get_write_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     present_service = PresentService(db)
     return await present_service.update_present(present_id, present)
 
 @router.delete("/{present_id}", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("10/minute")
-async def delete_present(request: Request,present_id: int, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def delete_present(request: Request,present_id: int, db:Session = Depends(get_write_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     present_service = PresentService(db)
     await present_service.delete_present(present_id)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database.routing import get_read_db
+from app.services.search import SearchService
+from app.schemas.search import SearchPage
+from app.security.dependencies import get_current_user, require_user_role
+from app.models.user import User
+from app.core.limit import limiter
+from app.core.serialization import ModelJSONResponse
+from app.config import settings
+
+router = APIRouter(
+    prefix="/api/search",
+    tags=["search"]
+)
+
+@router.get("/", response_model=SearchPage, status_code=status.HTTP_200_OK)
+@limiter.limit("30/minute")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(settings.page_default_size, ge=1, le=settings.page_max_size),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    search_service = SearchService(db)
+    page = await search_service.search(current_user.id, q, limit, cursor)
+    return ModelJSONResponse(page)
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, status, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal, Optional, Union
 
-from app.database.database import get_db
+from app.database.routing import get_read_db, get_write_db
 from app.services.wishlist import WishlistService
-from app.schemas.wishlist import WishlistResponse, WishlistCreate, WishlistUpdate
+from app.services.present import PresentService
+from app.services.present_import import PresentImportService
+from app.schemas.wishlist import WishlistResponse, WishlistDetailResponse, WishlistPage, WishlistCreate, WishlistUpdate, WishlistStats
+from app.schemas.present import PresentPage, PresentFilter, PresentImportResponse
 from app.security.dependencies import get_current_user, require_user_role
 from app.models.user import User
 from app.core.limit import limiter
+from app.core.etag import etag_matches, not_modified
+from app.core.serialization import ModelJSONResponse
+from app.config import settings
 
 
 router = APIRouter(
@@ -15,29 +21,111 @@ router = APIRouter(
     tags=["wishlist"]
 )
 
-@router.get("/", response_model=List[WishlistResponse], status_code=status.HTTP_200_OK)
+@router.get("/", response_model=WishlistPage, status_code=status.HTTP_200_OK)
 @limiter.limit("10/minute")
-async def get_wishlists(request: Request, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def get_wishlists(
+    request: Request,
+    limit: int = Query(settings.page_default_size, ge=1, le=settings.page_max_size),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
     wishlist_service = WishlistService(db)
-    return await wishlist_service.get_wishlists()
+    etag = await wishlist_service.get_wishlists_etag(current_user.id, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    page = await wishlist_service.get_wishlists(current_user.id, limit, cursor)
+    return ModelJSONResponse(page, headers={"ETag": etag})
 
-@router.get("/{wishlist_id}", response_model=WishlistResponse, status_code=status.HTTP_200_OK)
+@router.get("/{wishlist_id}", response_model=Union[WishlistDetailResponse, WishlistResponse], status_code=status.HTTP_200_OK)
 @limiter.limit("10/minute")
-async def get_wishlist(request: Request,wishlist_id: int, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def get_wishlist(
+    request: Request,
+    response: Response,
+    wishlist_id: int,
+    include: Optional[Literal["presents"]] = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
     wishlist_service = WishlistService(db)
-    return await wishlist_service.get_wishlist_by_id(wishlist_id)
+    if include == "presents":
+        etag = await wishlist_service.get_wishlist_detail_etag(wishlist_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        return await wishlist_service.get_wishlist_detail(wishlist_id)
+    updated_at = await wishlist_service.get_wishlist_version(wishlist_id)
+    etag = wishlist_service.wishlist_etag(wishlist_id, updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    etag, wishlist = await wishlist_service.get_wishlist_by_id(wishlist_id, updated_at)
+    response.headers["ETag"] = etag
+    return wishlist
+
+@router.get("/{wishlist_id}/presents", response_model=PresentPage, status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute")
+async def get_wishlist_presents(
+    request: Request,
+    wishlist_id: int,
+    limit: int = Query(settings.page_default_size, ge=1, le=settings.page_max_size),
+    cursor: Optional[str] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    order: Literal["asc", "desc"] = "asc",
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    filters = PresentFilter(min_price=min_price, max_price=max_price, order=order)
+    present_service = PresentService(db)
+    etag = await present_service.get_presents_etag(wishlist_id=wishlist_id, limit=limit, cursor=cursor, filters=filters)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    page = await present_service.get_presents_by_wishlist(wishlist_id, limit, cursor, filters)
+    return ModelJSONResponse(page, headers={"ETag": etag})
+
+@router.get("/{wishlist_id}/stats", response_model=WishlistStats, status_code=status.HTTP_200_OK)
+@limiter.limit("30/minute")
+async def get_wishlist_stats(
+    request: Request,
+    wishlist_id: int,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    wishlist_service = WishlistService(db)
+    return await wishlist_service.get_wishlist_stats(wishlist_id)
+
+@router.post("/{wishlist_id}/import", response_model=PresentImportResponse, status_code=status.HTTP_200_OK)
+@limiter.limit("2/minute")
+async def import_presents(
+    request: Request,
+    wishlist_id: int,
+    db: Session = Depends(get_write_db),
+    current_user=Depends(get_current_user),
+    user: User = Depends(require_user_role),
+):
+    import_service = PresentImportService(db)
+    return await import_service.import_presents(
+        wishlist_id,
+        current_user.id,
+        request.headers.get("content-type", ""),
+        request.stream(),
+    )
 
 @router.post("/", response_model = WishlistResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
-async def create_wishlist(request: Request,wishlist: WishlistCreate, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def create_wishlist(request: Request,wishlist: WishlistCreate, background_tasks: BackgroundTasks, db:Session = Depends(get_write_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     wishlist_data = wishlist.model_dump()
     wishlist_data["user_id"] = current_user.id
     wishlist_service = WishlistService(db)
-    return await wishlist_service.create_wishlist(wishlist_data)
+    return await wishlist_service.create_wishlist(wishlist_data, background_tasks)
 
 @router.put("/{wishlist_id}", response_model=WishlistResponse, status_code=status.HTTP_200_OK)
 @limiter.limit("5/minute")
-async def update_wishlist(request: Request,wishlist_id: int, wishlist: WishlistUpdate, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def update_wishlist(request: Request,wishlist_id: int, wishlist: WishlistUpdate, db:Session = Depends(get_write_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     wishlist_data = wishlist.model_dump()
     wishlist_data["user_id"] = current_user.id
     wishlist_service = WishlistService(db)
@@ -45,6 +133,6 @@ async def update_wishlist(request: Request,wishlist_id: int, wishlist: WishlistU
 
 @router.delete("/{wishlist_id}", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("10/minute")
-async def delete_wishlist(request: Request,wishlist_id: int, db:Session = Depends(get_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
+async def delete_wishlist(request: Request,wishlist_id: int, db:Session = Depends(get_write_db), current_user=Depends(get_current_user), user: User = Depends(require_user_role)):
     wishlist_service = WishlistService(db)
     await wishlist_service.delete_wishlist(wishlist_id)
@@ -1,25 +1,102 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+
+from app.config import settings
+
+# Границы presents.price NUMERIC(10, 2)
+PRICE_MAX = 99_999_999.99
+
+
+def reject_nul(value: Optional[str]) -> Optional[str]:
+    # PostgreSQL не хранит \x00 в текстовых колонках
+    if value is not None and "\x00" in value:
+        raise ValueError("NUL characters are not allowed")
+    return value
+
 
 class PresentBase(BaseModel):
     url: str = Field(..., max_length=255)
     name: str = Field(..., max_length=100)
-    price: Optional[float] = None
+    price: Optional[float] = Field(None, ge=-PRICE_MAX, le=PRICE_MAX)
     description: Optional[str] = Field(None, max_length=255)
 
+    @field_validator("url", "name", "description")
+    @classmethod
+    def check_nul(cls, value: Optional[str]) -> Optional[str]:
+        return reject_nul(value)
+
 class PresentCreate(PresentBase):
     wishlist_id: int
 
 class PresentUpdate(BaseModel):
     url: Optional[str] = Field(None, max_length=255)
     name: Optional[str] = Field(None, max_length=100)
-    price: Optional[float] = None
+    price: Optional[float] = Field(None, ge=-PRICE_MAX, le=PRICE_MAX)
     description: Optional[str] = Field(None, max_length=255)
     wishlist_id: Optional[int] = None
 
+    @field_validator("url", "name", "wishlist_id")
+    @classmethod
+    def check_not_null(cls, value):
+        # Валидатор срабатывает только на переданные поля: явный null для NOT NULL колонки
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+
+    @field_validator("url", "name", "description")
+    @classmethod
+    def check_nul(cls, value: Optional[str]) -> Optional[str]:
+        return reject_nul(value)
+
 class PresentResponse(PresentBase):
     id: int
     wishlist_id: int
 
     class Config:
         from_attributes = True
+
+class PresentFilter(BaseModel):
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    order: Literal["asc", "desc"] = "asc"
+
+class PresentPage(BaseModel):
+    items: List[PresentResponse]
+    next_cursor: Optional[str] = None
+
+class PresentBatchCreate(BaseModel):
+    items: List[PresentCreate] = Field(..., min_length=1, max_length=settings.present_batch_max_size)
+
+class PresentBatchUpdateItem(PresentUpdate):
+    id: int
+
+class PresentBatchUpdate(BaseModel):
+    items: List[PresentBatchUpdateItem] = Field(..., min_length=1, max_length=settings.present_batch_max_size)
+
+class PresentBatchDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.present_batch_max_size)
+
+class PresentBatchError(BaseModel):
+    index: int
+    detail: str
+
+class PresentBatchResponse(BaseModel):
+    items: List[PresentResponse]
+    errors: List[PresentBatchError]
+
+class PresentBatchDeleteResponse(BaseModel):
+    deleted: List[int]
+    errors: List[PresentBatchError]
+
+class PresentImportError(BaseModel):
+    line: int
+    detail: str
+
+class PresentImportResponse(BaseModel):
+    received: int
+    invalid: int
+    inserted: int
+    duplicates: int
+    seconds: float
+    rows_per_second: float
+    errors: List[PresentImportError]
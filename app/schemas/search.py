@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+
+class SearchHit(BaseModel):
+    kind: Literal["present", "wishlist"]
+    id: int
+    name: str
+    description: Optional[str] = None
+    url: Optional[str] = None
+    wishlist_id: Optional[int] = None
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from enum import Enum
+from typing import List, Optional
 
 class RoleEnum(str, Enum):
     USER = "user"
@@ -20,3 +21,13 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class CurrentUser(BaseModel):
+    id: int
+    role: RoleEnum
+
+    class Config:
+        from_attributes = True
+
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
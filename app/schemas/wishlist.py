@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
+from app.schemas.present import PresentResponse
+
 class WishlistBase(BaseModel):
     name:str = Field(..., max_length=100)
     description: Optional[str] = Field(None, max_length=255)
@@ -21,3 +23,18 @@ class WishlistResponse(WishlistBase):
 
     class Config:
         from_attributes = True
+
+class WishlistDetailResponse(WishlistResponse):
+    presents: List[PresentResponse]
+
+class WishlistPage(BaseModel):
+    items: List[WishlistResponse]
+    next_cursor: Optional[str] = None
+
+class WishlistStats(BaseModel):
+    wishlist_id: int
+    count: int
+    priced_count: int
+    total: float
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
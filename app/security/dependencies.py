@@ -1,30 +1,44 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database.database import get_db
 from app.security.jwt import decode_access_token
+from app.security.user_cache import user_cache
 from app.repositories.user_repo import UserRepository
 from app.security.oauth2 import oauth2_scheme
-from app.models.user import User, RoleEnum
+from app.models.user import RoleEnum
+from app.schemas.user import CurrentUser
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_db),
-):
+) -> CurrentUser:
     payload = await decode_access_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=401, detail="Invalid token")
 
     user_id = int(payload["sub"])
-    user = await UserRepository(session).get_user_by_id(user_id)
+    # ключ для rate limiter-а
+    request.state.user_id = user_id
+    if settings.auth_trust_token_claims and "role" in payload:
+        return CurrentUser(id=user_id, role=payload["role"])
+
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
 
-    if not user:
+    db_user = await UserRepository(session).get_user_by_id(user_id)
+    if not db_user:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
+    user = CurrentUser.model_validate(db_user)
+    user_cache.set(user_id, user)
     return user
 
 async def require_user_role(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role not in [RoleEnum.USER]:
         raise HTTPException(
@@ -1,9 +1,74 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config import settings
+
+# Хэши с другим числом раундов считаются устаревшими и перехэшируются при входе
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
+
+# bcrypt отпускает GIL, поэтому хватает потоков; вычисления не блокируют event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+# Задачи в пуле, включая ещё не начатые; уменьшается, когда задача реально завершилась,
+# а не когда ожидающий запрос отменили — иначе отменённые хэши копились бы в очереди сверх лимита
+_pending = 0
+_pending_lock = threading.Lock()
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _release(_future: Future) -> None:
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+async def _run_in_pool(func: Callable[..., Any], *args: Any) -> Any:
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.password_hash_max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    future = _executor.submit(func, *args)
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return await _run_in_pool(verify_and_update_password, plain_password, hashed_password)
+
+def password_pool_stats() -> dict:
+    return {
+        "workers": settings.password_hash_workers,
+        "pending": _pending,
+        "max_pending": settings.password_hash_max_pending,
+    }
@@ -0,0 +1,12 @@
+from app.config import settings
+from app.core.cache import TTLCache
+
+# id пользователя -> CurrentUser; заполняется в get_current_user
+user_cache = TTLCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl_seconds,
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.pop(user_id)
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterable
+
+from app.config import settings
+from app.database.database import AsyncReadSessionLocal
+from app.repositories.present_repo import PresentRepository
+from app.repositories.wishlist_repo import WishlistRepository
+
+CSV_COLUMNS = [
+    "type", "id", "wishlist_id", "name", "url", "price",
+    "description", "event_date", "created_at", "updated_at",
+]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class ExportService:
+    """Потоковая выгрузка данных пользователя: в памяти держится одна пачка строк."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.chunk_size = settings.export_chunk_size
+
+    async def _records(self) -> AsyncIterator[Iterable[Dict[str, Any]]]:
+        # Своя сессия: генератор живёт дольше обработчика запроса
+        async with AsyncReadSessionLocal() as session:
+            wishlists = await WishlistRepository(session).stream_wishlists(self.user_id, self.chunk_size)
+            async for rows in wishlists.mappings().partitions(self.chunk_size):
+                yield ({"type": "wishlist", **row} for row in rows)
+
+            presents = await PresentRepository(session).stream_presents(self.user_id, self.chunk_size)
+            async for rows in presents.mappings().partitions(self.chunk_size):
+                yield ({"type": "present", **row} for row in rows)
+
+    async def stream_ndjson(self) -> AsyncIterator[bytes]:
+        async for records in self._records():
+            yield "".join(
+                json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+                for record in records
+            ).encode()
+
+    async def stream_csv(self) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        async for records in self._records():
+            writer.writerows(records)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
@@ -1,9 +1,26 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Optional, Tuple
+from datetime import datetime
 from fastapi import HTTPException, status
 
 from app.repositories.wishlist_repo import WishlistRepository
-from app.schemas.present import PresentResponse, PresentCreate, PresentUpdate
+from app.schemas.present import (
+    PresentResponse,
+    PresentPage,
+    PresentFilter,
+    PresentCreate,
+    PresentUpdate,
+    PresentBatchCreate,
+    PresentBatchUpdate,
+    PresentBatchDelete,
+    PresentBatchError,
+    PresentBatchResponse,
+    PresentBatchDeleteResponse,
+)
+from app.core.pagination import clamp_limit, decode_cursor, split_page
+from app.core.serialization import construct_rows
+from app.core.response_cache import VERSION_DELETED, VersionChanged, response_cache, present_key, present_version_key
+from app.core.etag import make_etag
 from app.repositories.present_repo import PresentRepository
 from app.repositories.user_repo import UserRepository
 
@@ -13,15 +30,93 @@ class PresentService:
         self.user_repo = UserRepository(session)
         self.wishlist_repo = WishlistRepository(session)
 
-    async def get_presents(self) -> List[PresentResponse]:
-        presents = await self.present_repo.get_all_presents()
-        return [PresentResponse.model_validate(present) for present in presents]
+    @staticmethod
+    def _check_filter(filters: Optional[PresentFilter]) -> None:
+        if filters and filters.min_price is not None and filters.max_price is not None \
+                and filters.min_price > filters.max_price:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="min_price is greater than max_price")
 
-    async def get_present_by_id(self, present_id: int) -> PresentResponse:
+    async def get_presents(
+        self,
+        user_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        filters: Optional[PresentFilter] = None,
+    ) -> PresentPage:
+        self._check_filter(filters)
+        limit = clamp_limit(limit)
+        presents = await self.present_repo.get_all_presents(limit + 1, decode_cursor(cursor), user_id, filters)
+        presents, next_cursor = split_page(presents, limit)
+        return PresentPage.model_construct(items=construct_rows(PresentResponse, presents), next_cursor=next_cursor)
+
+    async def get_presents_by_wishlist(
+        self,
+        wishlist_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        filters: Optional[PresentFilter] = None,
+    ) -> PresentPage:
+        self._check_filter(filters)
+        wishlist = await self.wishlist_repo.get_wishlist_by_id(wishlist_id)
+        if not wishlist:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        limit = clamp_limit(limit)
+        presents = await self.present_repo.get_presents_by_wishlist(
+            wishlist_id, limit + 1, decode_cursor(cursor), filters
+        )
+        presents, next_cursor = split_page(presents, limit)
+        return PresentPage.model_construct(items=construct_rows(PresentResponse, presents), next_cursor=next_cursor)
+
+    async def get_presents_etag(
+        self,
+        user_id: Optional[int] = None,
+        wishlist_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        filters: Optional[PresentFilter] = None,
+    ) -> str:
+        count, last_updated = await self.present_repo.get_presents_version(user_id, wishlist_id)
+        filters = filters or PresentFilter()
+        return make_etag(
+            "presents", user_id, wishlist_id, count, last_updated, clamp_limit(limit), cursor,
+            filters.min_price, filters.max_price, filters.order,
+        )
+
+    async def get_present_version(self, present_id: int) -> datetime:
+        """Версия для ETag и ключа кэша: из Redis (её ставит каждая запись), при промахе — из БД."""
+        cached = await response_cache.get_version(present_version_key(present_id))
+        if cached == VERSION_DELETED:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Present not found")
+        if cached is not None:
+            return datetime.fromisoformat(cached)
+        updated_at = await self.present_repo.get_present_version(present_id)
+        if updated_at is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Present not found")
+        await response_cache.set_versions({present_version_key(present_id): updated_at}, only_if_absent=True)
+        return updated_at
+
+    @staticmethod
+    def present_etag(present_id: int, updated_at: datetime) -> str:
+        return make_etag("present", present_id, updated_at)
+
+    async def get_present_by_id(self, present_id: int, updated_at: datetime) -> Tuple[str, PresentResponse]:
+        """Возвращает ETag и тело одной и той же версии строки."""
+        try:
+            present = await response_cache.get_or_load(
+                present_key(present_id, updated_at), PresentResponse, lambda: self._load_present(present_id, updated_at)
+            )
+        except VersionChanged as changed:
+            present, updated_at = changed.value, changed.version
+        return self.present_etag(present_id, updated_at), present
+
+    async def _load_present(self, present_id: int, updated_at: datetime) -> PresentResponse:
         present = await self.present_repo.get_present_by_id(present_id)
         if not present:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Present not found")
-        return PresentResponse.model_validate(present)
+        response = PresentResponse.model_validate(present)
+        if present.updated_at != updated_at:
+            raise VersionChanged(response, present.updated_at)
+        return response
 
     async def create_present(self, data: PresentCreate) -> PresentResponse:
         wishlist = await self.wishlist_repo.get_wishlist_by_id(data.wishlist_id)
@@ -35,16 +130,69 @@ class PresentService:
             wishlist = await self.wishlist_repo.get_wishlist_by_id(data.wishlist_id)
             if not wishlist:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
-        present = await self.present_repo.get_present_by_id(present_id)
+        present = await self.present_repo.update_present(present_id, data.model_dump(exclude_unset=True))
         if not present:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Present not found")
-        for key, value in data.dict(exclude_unset=True).items():
-            setattr(present, key, value)
-        await self.present_repo.session.commit()
-        await self.present_repo.session.refresh(present)
+        await response_cache.set_versions({present_version_key(present_id): present.updated_at})
         return PresentResponse.model_validate(present)
 
     async def delete_present(self, present_id: int) -> None:
         success = await self.present_repo.delete_present(present_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Present not found")
+        await response_cache.mark_deleted(present_version_key(present_id))
+
+    async def create_presents(self, data: PresentBatchCreate, user_id: int) -> PresentBatchResponse:
+        existing = await self.wishlist_repo.get_existing_ids((item.wishlist_id for item in data.items), user_id)
+        rows, indexes, errors = [], [], []
+        for index, item in enumerate(data.items):
+            if item.wishlist_id not in existing:
+                errors.append(PresentBatchError(index=index, detail="Wishlist not found"))
+                continue
+            rows.append(item.model_dump())
+            indexes.append(index)
+        items = []
+        for index, (present, error) in zip(indexes, await self.present_repo.create_presents(rows)):
+            if error is not None:
+                errors.append(PresentBatchError(index=index, detail=error))
+            else:
+                items.append(PresentResponse.model_validate(present))
+        errors.sort(key=lambda error: error.index)
+        return PresentBatchResponse(items=items, errors=errors)
+
+    async def update_presents(self, data: PresentBatchUpdate, user_id: int) -> PresentBatchResponse:
+        existing = await self.wishlist_repo.get_existing_ids(
+            (item.wishlist_id for item in data.items if item.wishlist_id is not None), user_id
+        )
+        rows, indexes, errors = [], [], []
+        for index, item in enumerate(data.items):
+            if item.wishlist_id is not None and item.wishlist_id not in existing:
+                errors.append(PresentBatchError(index=index, detail="Wishlist not found"))
+                continue
+            rows.append(item.model_dump(exclude_unset=True) | {"id": item.id})
+            indexes.append(index)
+        items, versions = [], {}
+        for index, (present, error) in zip(indexes, await self.present_repo.update_presents(rows, user_id)):
+            if error is not None:
+                errors.append(PresentBatchError(index=index, detail=error))
+            elif present is None:
+                errors.append(PresentBatchError(index=index, detail="Present not found"))
+            else:
+                items.append(PresentResponse.model_validate(present))
+                versions[present_version_key(present.id)] = present.updated_at
+        errors.sort(key=lambda error: error.index)
+        await response_cache.set_versions(versions)
+        return PresentBatchResponse(items=items, errors=errors)
+
+    async def delete_presents(self, data: PresentBatchDelete, user_id: int) -> PresentBatchDeleteResponse:
+        deleted = set(await self.present_repo.delete_presents(data.ids, user_id))
+        await response_cache.mark_deleted(*(present_version_key(present_id) for present_id in deleted))
+        errors = [
+            PresentBatchError(index=index, detail="Present not found")
+            for index, present_id in enumerate(data.ids)
+            if present_id not in deleted
+        ]
+        return PresentBatchDeleteResponse(
+            deleted=[present_id for present_id in data.ids if present_id in deleted],
+            errors=errors,
+        )
@@ -0,0 +1,142 @@
+import csv
+import json
+import time
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.repositories.present_repo import PresentRepository
+from app.repositories.wishlist_repo import WishlistRepository
+from app.schemas.present import PresentBase, PresentImportError, PresentImportResponse
+
+CSV_TYPES = ("text/csv", "application/csv")
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace").rstrip("\r")
+
+
+class PresentImportService:
+    """Загрузка каталога подарков: CSV (одна запись на строку) или NDJSON.
+
+    Строки валидируются PresentBase пачками по import_batch_size,
+    загружаются COPY во временную таблицу и сливаются в presents
+    одним INSERT ... SELECT без дублей по url.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.present_repo = PresentRepository(session)
+        self.wishlist_repo = WishlistRepository(session)
+
+    async def import_presents(
+        self, wishlist_id: int, user_id: int, content_type: str, chunks: AsyncIterator[bytes]
+    ) -> PresentImportResponse:
+        wishlist = await self.wishlist_repo.get_wishlist_by_id(wishlist_id)
+        if not wishlist:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        if wishlist.user_id != user_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in CSV_TYPES:
+            records = self._parse_csv(iter_lines(chunks))
+        elif media_type in NDJSON_TYPES:
+            records = self._parse_ndjson(iter_lines(chunks))
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Expected text/csv or application/x-ndjson",
+            )
+
+        started = time.perf_counter()
+        received = invalid = valid = 0
+        errors: List[PresentImportError] = []
+        batch: List[Tuple[Any, ...]] = []
+
+        await self.present_repo.create_import_staging()
+        async for line_number, record, error in records:
+            received += 1
+            if error is None:
+                try:
+                    present = PresentBase.model_validate(record)
+                except ValidationError as e:
+                    error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                else:
+                    price = Decimal(str(present.price)) if present.price is not None else None
+                    batch.append((present.url, present.name, price, present.description))
+            if error is not None:
+                invalid += 1
+                if len(errors) < settings.import_max_reported_errors:
+                    errors.append(PresentImportError(line=line_number, detail=error))
+                continue
+            valid += 1
+            if len(batch) >= settings.import_batch_size:
+                await self.present_repo.copy_to_staging(batch)
+                batch = []
+        if batch:
+            await self.present_repo.copy_to_staging(batch)
+
+        inserted = await self.present_repo.merge_staging(wishlist_id) if valid else 0
+        if not valid:
+            await self.present_repo.session.rollback()
+        seconds = time.perf_counter() - started
+        return PresentImportResponse(
+            received=received,
+            invalid=invalid,
+            inserted=inserted,
+            duplicates=valid - inserted,
+            seconds=round(seconds, 3),
+            rows_per_second=round(received / seconds, 1) if seconds else 0.0,
+            errors=errors,
+        )
+
+    @staticmethod
+    async def _parse_csv(lines: AsyncIterator[str]):
+        header: Optional[List[str]] = None
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                values = next(csv.reader([line]))
+            except csv.Error as e:
+                yield line_number, None, str(e)
+                continue
+            if header is None:
+                header = [column.strip().lower() for column in values]
+                continue
+            record: Dict[str, Any] = dict(zip(header, values))
+            for key in ("price", "description"):
+                if record.get(key) == "":
+                    record[key] = None
+            yield line_number, record, None
+
+    @staticmethod
+    async def _parse_ndjson(lines: AsyncIterator[str]):
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, record, None
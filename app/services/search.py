@@ -0,0 +1,24 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.pagination import clamp_limit, decode_search_cursor, encode_search_cursor
+from app.core.serialization import construct_rows
+from app.repositories.search_repo import SearchRepository
+from app.schemas.search import SearchHit, SearchPage
+
+
+class SearchService:
+    def __init__(self, session: AsyncSession):
+        self.search_repo = SearchRepository(session)
+
+    async def search(
+        self, user_id: int, query: str, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> SearchPage:
+        limit = clamp_limit(limit)
+        rows = await self.search_repo.search(user_id, query.strip(), limit + 1, decode_search_cursor(cursor))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_search_cursor(last.rank, last.kind, last.id)
+        return SearchPage.model_construct(items=construct_rows(SearchHit, rows), next_cursor=next_cursor)
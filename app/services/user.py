@@ -1,20 +1,29 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
+import logging
 
-from app.schemas.user import UserResponse, UserCreate
+from app.schemas.user import UserResponse, UserPage, UserCreate
+from app.core.pagination import clamp_limit, decode_cursor, split_page
 from app.repositories.user_repo import UserRepository
-from app.security.password import hash_password, verify_password
+from app.security.password import hash_password_async, verify_and_update_password_async
 from app.security.jwt import create_access_token
 
+logger = logging.getLogger(__name__)
+
 class UserService:
     def __init__(self, session: AsyncSession):
         self.user_repo = UserRepository(session)
 
-    async def get_users(self) -> List[UserResponse]:
-        users = await self.user_repo.get_all_users()
-        return [UserResponse.model_validate(user) for user in users]
+    async def get_users(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> UserPage:
+        limit = clamp_limit(limit)
+        users = await self.user_repo.get_all_users(limit + 1, decode_cursor(cursor))
+        users, next_cursor = split_page(users, limit)
+        return UserPage(
+            items=[UserResponse.model_validate(user) for user in users],
+            next_cursor=next_cursor,
+        )
 
     async def get_user_by_id(self, user_id: int) -> UserResponse:
         user = await self.user_repo.get_user_by_id(user_id)
@@ -30,7 +39,7 @@ class UserService:
                 detail="User with this email already exists"
             )
         user_data = data.model_dump(exclude={"password"})
-        user_data["hashed_password"] = hash_password(data.password)
+        user_data["hashed_password"] = await hash_password_async(data.password)
 
         try:
             user = await self.user_repo.create_user(user_data)
@@ -57,8 +66,17 @@ class UserService:
         if not user:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+        if not valid:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        token = await create_access_token({"sub": str(user.id)})
+        claims = {"sub": str(user.id), "role": user.role.value}
+        if new_hash:
+            try:
+                await self.user_repo.update_user(user.id, {"hashed_password": new_hash})
+            except Exception:
+                await self.user_repo.session.rollback()
+                logger.warning("Не удалось перехэшировать пароль пользователя %s", claims["sub"], exc_info=True)
+
+        token = await create_access_token(claims)
         return token
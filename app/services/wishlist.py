@@ -1,13 +1,28 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from fastapi import HTTPException, status
-from datetime import date
+from typing import Optional, Tuple
+from fastapi import BackgroundTasks, HTTPException, status
+from datetime import date, datetime
 import logging
 
+from app.core.pagination import clamp_limit, decode_cursor, split_page
+from app.core.serialization import construct_rows
 from app.repositories.wishlist_repo import WishlistRepository
-from app.schemas.wishlist import WishlistResponse, WishlistCreate, WishlistUpdate
+from app.schemas.wishlist import WishlistResponse, WishlistDetailResponse, WishlistPage, WishlistCreate, WishlistUpdate, WishlistStats
 from app.repositories.user_repo import UserRepository
-from app.tasks.tasks import enqueue_welcome_email
+from app.repositories.present_repo import PresentRepository
+from app.repositories.outbox_repo import OutboxRepository, WELCOME_EMAIL_TOPIC
+from app.core.response_cache import (
+    VERSION_DELETED,
+    VersionChanged,
+    response_cache,
+    present_version_key,
+    wishlist_key,
+    wishlist_version_key,
+)
+from app.core.etag import make_etag
+from app.schemas.present import PresentResponse
+from app.tasks.tasks import enqueue_welcome_email_async
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -15,16 +30,90 @@ class WishlistService:
     def __init__(self, session: AsyncSession):
         self.wishlist_repo = WishlistRepository(session)
         self.user_repo = UserRepository(session)
+        self.present_repo = PresentRepository(session)
+        self.outbox_repo = OutboxRepository(session)
 
-    async def get_wishlists(self) -> List[WishlistResponse]:
-        wishlists = await self.wishlist_repo.get_all_wishlists()
-        return [WishlistResponse.model_validate(wishlist) for wishlist in wishlists]
+    async def get_wishlists(
+        self, user_id: Optional[int] = None, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> WishlistPage:
+        limit = clamp_limit(limit)
+        wishlists = await self.wishlist_repo.get_all_wishlists(limit + 1, decode_cursor(cursor), user_id)
+        wishlists, next_cursor = split_page(wishlists, limit)
+        return WishlistPage.model_construct(items=construct_rows(WishlistResponse, wishlists), next_cursor=next_cursor)
 
-    async def get_wishlist_by_id(self, wishlist_id: int) -> WishlistResponse:
+    async def get_wishlists_etag(
+        self, user_id: Optional[int] = None, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> str:
+        count, last_updated = await self.wishlist_repo.get_wishlists_version(user_id)
+        return make_etag("wishlists", user_id, count, last_updated, clamp_limit(limit), cursor)
+
+    async def get_wishlist_version(self, wishlist_id: int) -> datetime:
+        """Версия для ETag и ключа кэша: из Redis (её ставит каждая запись), при промахе — из БД."""
+        cached = await response_cache.get_version(wishlist_version_key(wishlist_id))
+        if cached == VERSION_DELETED:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        if cached is not None:
+            return datetime.fromisoformat(cached)
+        updated_at = await self.wishlist_repo.get_wishlist_version(wishlist_id)
+        if updated_at is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        await response_cache.set_versions({wishlist_version_key(wishlist_id): updated_at}, only_if_absent=True)
+        return updated_at
+
+    @staticmethod
+    def wishlist_etag(wishlist_id: int, updated_at: datetime) -> str:
+        return make_etag("wishlist", wishlist_id, updated_at)
+
+    async def get_wishlist_detail_etag(self, wishlist_id: int) -> str:
+        # Версия вишлиста и подарков одним запросом: detail всё равно идёт в БД, Redis тут не экономит
+        version = await self.wishlist_repo.get_wishlist_detail_version(wishlist_id)
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        updated_at, count, last_updated = version
+        return make_etag(self.wishlist_etag(wishlist_id, updated_at), "presents", count, last_updated)
+
+    async def get_wishlist_detail(self, wishlist_id: int) -> WishlistDetailResponse:
+        wishlist = await self.wishlist_repo.get_wishlist_with_presents(wishlist_id)
+        if not wishlist:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        presents = sorted(wishlist.presents, key=lambda present: (present.created_at, present.id))
+        return WishlistDetailResponse(
+            **WishlistResponse.model_validate(wishlist).model_dump(),
+            presents=[PresentResponse.model_validate(present) for present in presents],
+        )
+
+    async def get_wishlist_by_id(self, wishlist_id: int, updated_at: datetime) -> Tuple[str, WishlistResponse]:
+        """Возвращает ETag и тело одной и той же версии строки."""
+        try:
+            wishlist = await response_cache.get_or_load(
+                wishlist_key(wishlist_id, updated_at), WishlistResponse, lambda: self._load_wishlist(wishlist_id, updated_at)
+            )
+        except VersionChanged as changed:
+            wishlist, updated_at = changed.value, changed.version
+        return self.wishlist_etag(wishlist_id, updated_at), wishlist
+
+    async def _load_wishlist(self, wishlist_id: int, updated_at: datetime) -> WishlistResponse:
         wishlist = await self.wishlist_repo.get_wishlist_by_id(wishlist_id)
         if not wishlist:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
-        return WishlistResponse.model_validate(wishlist)
+        response = WishlistResponse.model_validate(wishlist)
+        if wishlist.updated_at != updated_at:
+            raise VersionChanged(response, wishlist.updated_at)
+        return response
+
+    async def get_wishlist_stats(self, wishlist_id: int) -> WishlistStats:
+        wishlist = await self.wishlist_repo.get_wishlist_by_id(wishlist_id)
+        if not wishlist:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        count, priced_count, total, min_price, max_price = await self.present_repo.get_price_stats(wishlist_id)
+        return WishlistStats(
+            wishlist_id=wishlist_id,
+            count=count,
+            priced_count=priced_count,
+            total=total,
+            min_price=min_price,
+            max_price=max_price,
+        )
 
     @staticmethod
     def parse_event_date(event_date_str):
@@ -33,39 +122,57 @@ class WishlistService:
         except Exception:
             return None
 
-    async def create_wishlist(self, data: WishlistCreate) -> WishlistResponse:
+    async def create_wishlist(
+        self, data: WishlistCreate, background_tasks: Optional[BackgroundTasks] = None
+    ) -> WishlistResponse:
         user = await self.user_repo.get_user_by_id(data["user_id"])
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
         if "event_date" in data and isinstance(data["event_date"], str):
             data["event_date"] = self.parse_event_date(data["event_date"])
+
+        if settings.email_use_outbox:
+            # Сообщение outbox коммитится вместе с вишлистом в create_wishlist
+            await self.outbox_repo.add_message(
+                WELCOME_EMAIL_TOPIC, {"to": user.email, "wishlist_name": data["name"]}
+            )
+            wishlist = await self.wishlist_repo.create_wishlist(data)
+            return WishlistResponse.model_validate(wishlist)
+
         wishlist = await self.wishlist_repo.create_wishlist(data)
+        if background_tasks is not None and settings.email_enqueue_in_background:
+            # Задержки Redis не попадают в latency ответа
+            background_tasks.add_task(self._enqueue_welcome_email, user.email, wishlist.name)
+        else:
+            await self._enqueue_welcome_email(user.email, wishlist.name)
+        return WishlistResponse.model_validate(wishlist)
 
+    @staticmethod
+    async def _enqueue_welcome_email(email: str, wishlist_name: str) -> None:
         try:
-            job_id = enqueue_welcome_email(user.email, wishlist.name)
+            job_id = await enqueue_welcome_email_async(email, wishlist_name)
             if job_id:
                 logger.info("Поставлена задача отправки приветственного письма, job_id=%s", job_id)
         except Exception as e:
             logger.error(f"Failed to enqueue email task: {str(e)}")
-        return WishlistResponse.model_validate(wishlist)
 
     async def update_wishlist(self, wishlist_id: int, data: WishlistUpdate) -> WishlistResponse:
-        user = await self.user_repo.get_user_by_id(data["user_id"])
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        wishlist = await self.wishlist_repo.get_wishlist_by_id(wishlist_id)
+        values = {key: value for key, value in data.items() if value is not None}
+        if isinstance(values.get("event_date"), str):
+            values["event_date"] = self.parse_event_date(values["event_date"])
+        wishlist = await self.wishlist_repo.update_wishlist(wishlist_id, values)
         if not wishlist:
-            raise HTTPException(tatus_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
-
-        for key, value in data.items():
-            if value is not None:
-                setattr(wishlist, key, value)
-        await self.wishlist_repo.session.commit()
-        await self.wishlist_repo.session.refresh(wishlist)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        await response_cache.set_versions({wishlist_version_key(wishlist_id): wishlist.updated_at})
         return WishlistResponse.model_validate(wishlist)
 
     async def delete_wishlist(self, wishlist_id: int) -> None:
+        # Подарки удаляются каскадом в БД, их версии в кэше тоже нужно закрыть
+        present_ids = await self.present_repo.get_present_ids_by_wishlist(wishlist_id)
         success = await self.wishlist_repo.delete_wishlist(wishlist_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist not found")
+        await response_cache.mark_deleted(
+            wishlist_version_key(wishlist_id), *(present_version_key(present_id) for present_id in present_ids)
+        )
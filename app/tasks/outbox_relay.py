@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import List
+
+import app.config as config
+from app.database.database import AsyncSessionLocal
+from app.models.outbox import OutboxMessage
+from app.repositories.outbox_repo import OutboxRepository, WELCOME_EMAIL_TOPIC
+from app.tasks.tasks import enqueue_email, welcome_email
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {
+    WELCOME_EMAIL_TOPIC: lambda payload: enqueue_email(*welcome_email(payload["to"], payload["wishlist_name"])),
+}
+
+
+def dispatch(messages: List[OutboxMessage]) -> None:
+    for message in messages:
+        HANDLERS[message.topic](message.payload)
+
+
+async def relay_once(batch_size: int) -> int:
+    """Переносит одну пачку outbox в очередь.
+
+    Строки удаляются в той же транзакции после успешной постановки, поэтому
+    при падении между постановкой и commit сообщение уйдёт повторно (at-least-once).
+    """
+    async with AsyncSessionLocal() as session:
+        repo = OutboxRepository(session)
+        messages = await repo.claim_batch(batch_size)
+        if not messages:
+            await session.rollback()
+            return 0
+        await asyncio.to_thread(dispatch, messages)
+        await repo.delete_messages([message.id for message in messages])
+        await session.commit()
+        return len(messages)
+
+
+async def get_outbox_lag() -> dict:
+    async with AsyncSessionLocal() as session:
+        pending, oldest = await OutboxRepository(session).get_lag()
+    return {
+        "pending": pending,
+        "lag_seconds": round((datetime.now() - oldest).total_seconds(), 3) if oldest else 0.0,
+    }
+
+
+async def run_relay() -> None:
+    settings = config.settings
+    logger.info("Outbox relay запущен, batch_size=%s", settings.outbox_batch_size)
+    while True:
+        try:
+            relayed = await relay_once(settings.outbox_batch_size)
+        except Exception:
+            logger.exception("Ошибка outbox relay, повтор через %s с", settings.outbox_poll_interval_seconds)
+            relayed = 0
+        if relayed < settings.outbox_batch_size:
+            await asyncio.sleep(settings.outbox_poll_interval_seconds)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_relay())
@@ -0,0 +1,154 @@
+import logging
+import os
+import queue
+import smtplib
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Iterator, Optional
+
+import app.config as config
+
+logger = logging.getLogger(__name__)
+
+
+class PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Постоянные SMTP-соединения воркера: STARTTLS и AUTH выполняются один раз на соединение.
+
+    Соединение закрывается после max_messages писем или при любой ошибке;
+    простаивавшее дольше idle_check_seconds проверяется NOOP перед выдачей.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        user: Optional[str],
+        password: Optional[str],
+        use_tls: bool,
+        size: int,
+        max_messages: int,
+        idle_check_seconds: float,
+        timeout: float = 30,
+    ):
+        self.server = server
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_check_seconds = idle_check_seconds
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue(maxsize=size)
+        self._pid = os.getpid()
+
+    def _connect(self) -> PooledConnection:
+        smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+        except Exception:
+            self._close(smtp)
+            raise
+        logger.info("Открыто SMTP-соединение с %s:%s", self.server, self.port)
+        return PooledConnection(smtp)
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        if time.monotonic() - conn.last_used < self.idle_check_seconds:
+            return True
+        try:
+            return conn.smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _acquire(self) -> PooledConnection:
+        if self._pid != os.getpid():
+            # после fork соединения родителя использовать нельзя
+            self._idle = queue.LifoQueue(maxsize=self.size)
+            self._pid = os.getpid()
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if self._is_healthy(conn):
+                return conn
+            self._close(conn.smtp)
+
+    def _release(self, conn: PooledConnection) -> None:
+        conn.last_used = time.monotonic()
+        if conn.messages_sent >= self.max_messages:
+            self._close(conn.smtp)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._close(conn.smtp)
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception:
+            self._close(conn.smtp)
+            raise
+        self._release(conn)
+
+    def send_message(self, msg: EmailMessage) -> None:
+        # Разорванное сервером соединение из пула переоткрываем один раз
+        for attempt in (1, 2):
+            try:
+                with self.connection() as conn:
+                    conn.smtp.send_message(msg)
+                    conn.messages_sent += 1
+                return
+            except smtplib.SMTPServerDisconnected:
+                if attempt == 2:
+                    raise
+                logger.warning("SMTP-соединение разорвано, переподключаемся")
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn.smtp)
+
+
+_pool: Optional[SMTPConnectionPool] = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _pool
+    if _pool is None:
+        settings = config.settings
+        _pool = SMTPConnectionPool(
+            server=settings.smtp_server,
+            port=settings.smtp_port,
+            user=settings.smtp_user,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls,
+            size=settings.smtp_pool_size,
+            max_messages=settings.smtp_max_messages_per_connection,
+            idle_check_seconds=settings.smtp_idle_check_seconds,
+        )
+    return _pool
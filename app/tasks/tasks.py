@@ -1,6 +1,10 @@
+import asyncio
+import json
 import logging
+import time
+import uuid
+from datetime import timedelta
 from email.message import EmailMessage
-import smtplib
 
 from redis import Redis
 from rq import Queue, Retry
@@ -8,23 +12,40 @@ from rq.job import Job
 from rq.exceptions import NoSuchJobError
 
 import app.config as config
+from app.core.redis import get_redis
+from app.tasks.smtp_pool import get_smtp_pool
 
 logger = logging.getLogger(__name__)
 
+# Буфер писем: enqueue кладёт сообщение в список, drain_email_buffer
+# отправляет их пачками через одно SMTP-соединение
+EMAIL_BUFFER_KEY = "emails:buffer"
+# Письма, взятые drain-ом, но ещё не подтверждённые; после сбоя возвращаются в буфер
+EMAIL_PROCESSING_KEY = "emails:processing"
+EMAIL_RETRY_KEY = "emails:retry"
+EMAIL_DRAIN_SCHEDULED_KEY = "emails:drain:scheduled"
+EMAIL_DRAIN_LOCK_KEY = "emails:drain:lock"
+EMAIL_QUEUE_TIMEOUT = 120
+EMAIL_DRAIN_BUSY_DELAY = 5
+EMAIL_STATUS_PREFIX = "emails:status:"
+EMAIL_ID_PREFIX = "email-"
+RETRY_INTERVALS = [10, 30, 60]
+# Упавший или убитый drain (RQ считает его abandoned) перезапускается сам
+DRAIN_RETRY = Retry(max=3, interval=[10, 30, 60])
+
 def get_redis_connection() -> Redis:
-    return Redis.from_url(config.settings.redis_url)
+    return get_redis()
 
 
 def get_email_queue() -> Queue:
     return Queue(
         name="emails",
         connection=get_redis_connection(),
-        default_timeout=120,
+        default_timeout=EMAIL_QUEUE_TIMEOUT,
     )
 
 
-def send_email_task(to: str, subject: str, body: str, from_email: str | None = None) -> str:
-    """Задача для RQ worker-а"""
+def build_email(to: str, subject: str, body: str, from_email: str | None = None) -> EmailMessage:
     msg = EmailMessage()
     msg.set_content(body)
     msg["Subject"] = subject
@@ -36,24 +57,22 @@ def send_email_task(to: str, subject: str, body: str, from_email: str | None = N
     )
     msg["From"] = from_addr
     msg["To"] = to
+    return msg
+
+
+def send_email_task(to: str, subject: str, body: str, from_email: str | None = None) -> str:
+    """Задача для RQ worker-а"""
+    msg = build_email(to, subject, body, from_email)
 
     server = config.settings.smtp_server
     port = config.settings.smtp_port
-    user = config.settings.smtp_user
-    password = config.settings.smtp_password
-    use_tls = config.settings.smtp_use_tls
 
     if not server or not port:
         logger.error("SMTP не сконфигурирован!")
         raise RuntimeError("SMTP конфигурация отсутствует")
 
     try:
-        with smtplib.SMTP(server, port, timeout=30) as smtp:
-            if use_tls:
-                smtp.starttls()
-            if user:
-                smtp.login(user, password or "")
-            smtp.send_message(msg)
+        get_smtp_pool().send_message(msg)
         logger.info("Email успешно отправлен → %s (тема: %s)", to, subject)
         return "success"
     except Exception as e:
@@ -61,25 +80,190 @@ def send_email_task(to: str, subject: str, body: str, from_email: str | None = N
         raise
 
 
-def enqueue_welcome_email(to: str, wishlist_name: str) -> str | None:
-    q = get_email_queue()
+def _set_email_status(redis: Redis, message_id: str, **fields) -> None:
+    key = EMAIL_STATUS_PREFIX + message_id
+    pipe = redis.pipeline(transaction=False)
+    pipe.hset(key, mapping={k: "" if v is None else str(v) for k, v in fields.items()})
+    pipe.expire(key, config.settings.email_status_ttl_seconds)
+    pipe.execute()
 
-    try:
-        job = q.enqueue(
-            send_email_task,
-            args=(to, "Ваш Вишлист создан успешно!", f"Вишлист '{wishlist_name}' создан."),
-            retry=Retry(max=3, interval=[10, 30, 60]),
-            result_ttl=3600 * 24,
-            description=f"Welcome email to {to}",
+
+def enqueue_email(to: str, subject: str, body: str, from_email: str | None = None) -> str:
+    message_id = f"{EMAIL_ID_PREFIX}{uuid.uuid4().hex}"
+    message = {
+        "id": message_id,
+        "to": to,
+        "subject": subject,
+        "body": body,
+        "from_email": from_email,
+        "attempts": 0,
+    }
+    redis = get_redis_connection()
+    status_key = EMAIL_STATUS_PREFIX + message_id
+
+    pipe = redis.pipeline(transaction=False)
+    pipe.hset(status_key, mapping={"status": "queued", "description": f"Email to {to}", "attempts": 0})
+    pipe.expire(status_key, config.settings.email_status_ttl_seconds)
+    pipe.rpush(EMAIL_BUFFER_KEY, json.dumps(message))
+    pipe.execute()
+
+    _schedule_drain(redis)
+    return message_id
+
+
+def _schedule_drain(redis: Redis) -> None:
+    # Одна задача drain на весь буфер. Флаг снимает сам drain после завершения, поэтому
+    # убитый посреди работы drain не теряет письма в processing: его перезапустит Retry,
+    # а в худшем случае флаг истечёт по TTL и следующее письмо поставит drain заново
+    if redis.set(EMAIL_DRAIN_SCHEDULED_KEY, 1, nx=True, ex=config.settings.email_drain_schedule_ttl_seconds):
+        _enqueue_drain()
+
+
+def _enqueue_drain() -> None:
+    get_email_queue().enqueue(
+        drain_email_buffer,
+        result_ttl=3600,
+        description="Drain email buffer",
+        retry=DRAIN_RETRY,
+    )
+
+
+def drain_email_buffer() -> dict:
+    """Задача для RQ worker-а: отправляет накопленные письма пачками по email_batch_size.
+
+    Одновременно работает один drain (lock). Письмо переносится LMOVE в processing
+    и снимается оттуда только после отправки, поэтому таймаут или падение задачи
+    письма не теряют: следующий drain вернёт их в буфер (доставка at-least-once).
+    Drain укладывается в email_drain_max_seconds и при непустом буфере ставит себя снова.
+    """
+    redis = get_redis_connection()
+    lock = redis.lock(EMAIL_DRAIN_LOCK_KEY, timeout=EMAIL_QUEUE_TIMEOUT + 30)
+    if not lock.acquire(blocking=False):
+        # Письма, пришедшие во время чужого drain, заберём чуть позже
+        get_email_queue().enqueue_in(
+            timedelta(seconds=EMAIL_DRAIN_BUSY_DELAY), drain_email_buffer, description="Drain email buffer"
         )
-        logger.info("Задача на отправку email поставлена, job_id = %s", job.id)
-        return job.id
+        return {"sent": 0, "retrying": 0, "failed": 0, "busy": True}
+
+    try:
+        stats = _drain(redis)
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            logger.warning("Не удалось снять lock drain-а писем", exc_info=True)
+
+    if not stats.pop("rescheduled", False):
+        # Флаг снимается только после успешного drain-а; письмо, пришедшее пока он был поднят,
+        # видно здесь по длине буфера — тогда drain ставится заново
+        redis.delete(EMAIL_DRAIN_SCHEDULED_KEY)
+        if redis.llen(EMAIL_BUFFER_KEY):
+            _schedule_drain(redis)
+    return stats
+
+
+def _drain(redis: Redis) -> dict:
+    pool = get_smtp_pool()
+    batch_size = config.settings.email_batch_size
+    deadline = time.monotonic() + config.settings.email_drain_max_seconds
+    stats = {"sent": 0, "retrying": 0, "failed": 0}
+
+    _restore_processing(redis)
+    while True:
+        _promote_due_retries(redis, batch_size)
+        if time.monotonic() >= deadline:
+            if redis.llen(EMAIL_BUFFER_KEY):
+                # Продолжение того же drain-а: флаг остаётся поднятым
+                redis.set(EMAIL_DRAIN_SCHEDULED_KEY, 1, ex=config.settings.email_drain_schedule_ttl_seconds)
+                _enqueue_drain()
+                stats["rescheduled"] = True
+            return stats
+
+        pipe = redis.pipeline(transaction=False)
+        for _ in range(batch_size):
+            pipe.lmove(EMAIL_BUFFER_KEY, EMAIL_PROCESSING_KEY, "LEFT", "RIGHT")
+        batch = [raw for raw in pipe.execute() if raw is not None]
+        if not batch:
+            return stats
+
+        for raw in batch:
+            message = json.loads(raw)
+            msg = build_email(message["to"], message["subject"], message["body"], message.get("from_email"))
+            try:
+                pool.send_message(msg)
+            except Exception as e:
+                logger.warning("Ошибка отправки email → %s", message["to"], exc_info=True)
+                stats[_schedule_retry(redis, message, e)] += 1
+            else:
+                _set_email_status(redis, message["id"], status="finished", result="success", attempts=message["attempts"] + 1)
+                stats["sent"] += 1
+            redis.lrem(EMAIL_PROCESSING_KEY, 1, raw)
+
+        logger.info("Отправлена пачка писем: %s", stats)
+
+
+def _restore_processing(redis: Redis) -> None:
+    # Под lock-ом processing принадлежит только упавшему drain-у: возвращаем в начало буфера по порядку
+    restored = 0
+    while redis.lmove(EMAIL_PROCESSING_KEY, EMAIL_BUFFER_KEY, "RIGHT", "LEFT") is not None:
+        restored += 1
+    if restored:
+        logger.warning("Возвращено в буфер неподтверждённых писем: %s", restored)
+
+
+def _promote_due_retries(redis: Redis, limit: int) -> None:
+    due = redis.zrangebyscore(EMAIL_RETRY_KEY, "-inf", time.time(), start=0, num=limit)
+    if not due:
+        return
+    # Перенос в буфер атомарный, дальше письмо идёт через processing как обычное
+    pipe = redis.pipeline(transaction=True)
+    pipe.zrem(EMAIL_RETRY_KEY, *due)
+    pipe.rpush(EMAIL_BUFFER_KEY, *due)
+    pipe.execute()
+
+
+def _schedule_retry(redis: Redis, message: dict, error: Exception) -> str:
+    message["attempts"] += 1
+    if message["attempts"] > len(RETRY_INTERVALS):
+        _set_email_status(redis, message["id"], status="failed", exc_info=repr(error), attempts=message["attempts"])
+        return "failed"
+
+    delay = RETRY_INTERVALS[message["attempts"] - 1]
+    redis.zadd(EMAIL_RETRY_KEY, {json.dumps(message): time.time() + delay})
+    _set_email_status(redis, message["id"], status="retrying", exc_info=repr(error), attempts=message["attempts"])
+    get_email_queue().enqueue_in(timedelta(seconds=delay), drain_email_buffer, description="Drain email retries")
+    return "retrying"
+
+
+def welcome_email(to: str, wishlist_name: str) -> tuple[str, str, str]:
+    return to, "Ваш Вишлист создан успешно!", f"Вишлист '{wishlist_name}' создан."
+
+
+def enqueue_welcome_email(to: str, wishlist_name: str) -> str | None:
+    try:
+        message_id = enqueue_email(*welcome_email(to, wishlist_name))
+        logger.info("Письмо поставлено в буфер отправки, id = %s", message_id)
+        return message_id
     except Exception as e:
         logger.error("Не удалось поставить задачу на email → %s", str(e), exc_info=True)
         return None
 
 
+async def enqueue_welcome_email_async(to: str, wishlist_name: str) -> str | None:
+    """Неблокирующая постановка письма из async-обработчиков: Redis-вызовы уходят в поток."""
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(enqueue_welcome_email, to, wishlist_name),
+            timeout=config.settings.email_enqueue_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        logger.error("Постановка письма для %s не уложилась в таймаут", to)
+        return None
+
+
 def get_job_status(job_id: str) -> dict:
+    if job_id.startswith(EMAIL_ID_PREFIX):
+        return _get_email_status(job_id)
     try:
         job = Job.fetch(job_id, connection=get_redis_connection())
         return {
@@ -93,4 +277,23 @@ def get_job_status(job_id: str) -> dict:
         return {"id": job_id, "status": "not_found"}
     except Exception as e:
         logger.warning("Ошибка при получении статуса job %s", job_id, exc_info=True)
-        return {"id": job_id, "status": "error", "error": str(e)}
\ No newline at end of file
+        return {"id": job_id, "status": "error", "error": str(e)}
+
+
+def _get_email_status(message_id: str) -> dict:
+    try:
+        data = get_redis_connection().hgetall(EMAIL_STATUS_PREFIX + message_id)
+    except Exception as e:
+        logger.warning("Ошибка при получении статуса письма %s", message_id, exc_info=True)
+        return {"id": message_id, "status": "error", "error": str(e)}
+    if not data:
+        return {"id": message_id, "status": "not_found"}
+    data = {key.decode(): value.decode() for key, value in data.items()}
+    return {
+        "id": message_id,
+        "status": data.get("status"),
+        "result": data.get("result") or None,
+        "exc_info": data.get("exc_info") or None,
+        "description": data.get("description"),
+        "attempts": int(data.get("attempts") or 0),
+    }
@@ -0,0 +1,49 @@
+"""Микробенчмарки. Запуск из корня репозитория: python -m bench.<имя> --help"""
+import statistics
+import time
+from typing import Callable, List, Sequence
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(name: str, samples: Sequence[float], unit: str = "ms", scale: float = 1000) -> None:
+    """samples — длительности в секундах."""
+    print(
+        f"{name:<28} n={len(samples):<7} "
+        f"p50={percentile(samples, 0.5) * scale:.3f}{unit} "
+        f"p99={percentile(samples, 0.99) * scale:.3f}{unit} "
+        f"mean={statistics.fmean(samples) * scale:.3f}{unit}"
+    )
+
+
+def throughput(name: str, func: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+    rate = iterations / elapsed
+    print(f"{name:<28} {rate:,.0f} ops/s ({elapsed / iterations * 1e6:.2f} µs/op)")
+    return rate
+
+
+def timed(samples: List[float]):
+    """Контекст для замера одной операции: with timed(samples): ..."""
+    return _Timer(samples)
+
+
+class _Timer:
+    def __init__(self, samples: List[float]):
+        self.samples = samples
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.started)
+        return False
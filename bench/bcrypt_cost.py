@@ -0,0 +1,34 @@
+"""Входов в секунду на одно ядро для разных значений BCRYPT_ROUNDS.
+
+Проверка пароля однопоточная, поэтому результат — ёмкость одного ядра;
+умножьте на PASSWORD_HASH_WORKERS (не больше числа ядер) для оценки воркера.
+"""
+import argparse
+import time
+
+from passlib.context import CryptContext
+
+PASSWORD = "correct horse battery staple"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13, 14])
+    parser.add_argument("--seconds", type=float, default=3, help="время замера на каждое значение")
+    args = parser.parse_args()
+
+    print(f"{'rounds':<8}{'ms/login':>10}{'logins/s/core':>16}")
+    for rounds in args.rounds:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        hashed = context.hash(PASSWORD)
+        logins = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < args.seconds:
+            context.verify(PASSWORD, hashed)
+            logins += 1
+        elapsed = time.perf_counter() - started
+        print(f"{rounds:<8}{elapsed / logins * 1000:>10.1f}{logins / elapsed:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
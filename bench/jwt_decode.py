@@ -0,0 +1,34 @@
+"""Холодная проверка JWT против decode_access_token с кэшем проверенных payload."""
+import argparse
+import asyncio
+import time
+
+from jose import jwt
+
+from bench import throughput
+from app.security.jwt import ALGORITHM, SECRET_KEY, create_access_token, decode_access_token, token_cache
+
+
+async def cached_decode(token: str, iterations: int) -> None:
+    token_cache.clear()
+    await decode_access_token(token)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await decode_access_token(token)
+    elapsed = time.perf_counter() - started
+    print(f"{'cached decode_access_token':<28} {iterations / elapsed:,.0f} ops/s ({elapsed / iterations * 1e6:.2f} µs/op)")
+    print("token_cache:", token_cache.stats())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    token = asyncio.run(create_access_token({"sub": "bench@example.com", "user_id": 1, "role": "user"}))
+    throughput("cold jose.jwt.decode", lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]), args.iterations)
+    asyncio.run(cached_decode(token, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Задержка event loop при параллельных входах: bcrypt прямо в loop против пула потоков.
+
+Фоновая корутина просыпается каждые --tick мс и записывает, насколько опоздала;
+одновременно выполняется --concurrency проверок пароля.
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from fastapi import HTTPException
+
+from bench import summarize
+from app.security.password import hash_password, verify_password, verify_password_async, password_pool_stats
+
+PASSWORD = "correct horse battery staple"
+
+
+async def ticker(lags: List[float], tick: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(tick)
+        lags.append(time.perf_counter() - started - tick)
+
+
+async def inline_login(hashed: str) -> None:
+    # Так выглядел authenticate до выноса bcrypt в пул
+    verify_password(PASSWORD, hashed)
+
+
+async def run(mode: str, hashed: str, concurrency: int, tick: float) -> None:
+    lags: List[float] = []
+    rejected = 0
+    stop = asyncio.Event()
+    ticker_task = asyncio.create_task(ticker(lags, tick, stop))
+    login = inline_login if mode == "inline" else (lambda h: verify_password_async(PASSWORD, h))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login(hashed) for _ in range(concurrency)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker_task
+
+    for result in results:
+        if isinstance(result, HTTPException) and result.status_code == 503:
+            rejected += 1
+        elif isinstance(result, BaseException):
+            raise result
+    summarize(f"{mode}: event loop lag", lags or [0.0])
+    print(f"{mode}: {concurrency} logins in {elapsed:.2f}s, rejected with 503: {rejected}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--tick", type=float, default=10, help="ms")
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+    print("password pool:", password_pool_stats())
+    for mode in ("inline", "pool"):
+        asyncio.run(run(mode, hashed, args.concurrency, args.tick / 1000))
+
+
+if __name__ == "__main__":
+    main()
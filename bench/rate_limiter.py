@@ -0,0 +1,58 @@
+"""Накладные расходы Redis-лимитера на запрос (REDIS_URL): один EVALSHA token bucket.
+
+Сравнивается пустой вызов обработчика и тот же вызов через limiter.limit().
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+
+from starlette.requests import Request
+
+from bench import summarize
+from app.core.limit import RateLimitExceeded, limiter
+from app.config import settings
+from app.core.redis import get_async_redis_pool
+
+
+def make_request(user_id: int) -> Request:
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "client": ("127.0.0.1", 50000)})
+    request.state.user_id = user_id
+    return request
+
+
+async def run(iterations: int) -> None:
+    if not settings.rate_limit_enabled:
+        raise SystemExit("RATE_LIMIT_ENABLED is off, nothing to measure")
+
+    async def handler(request: Request) -> None:
+        return None
+
+    # Лимит заведомо не достигается: меряем только стоимость проверки
+    limited = limiter.limit(f"{iterations * 10}/minute")(handler)
+    request = make_request(int(uuid.uuid4().int % 1_000_000_000))
+
+    for name, func in (("handler only", handler), ("handler + limiter", limited)):
+        samples: List[float] = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                await func(request=request)
+            except RateLimitExceeded:
+                raise SystemExit("limit reached, raise --iterations budget")
+            samples.append(time.perf_counter() - started)
+        summarize(name, samples, unit="µs", scale=1e6)
+
+    await get_async_redis_pool().disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Задержка /api/search на большом наборе (по умолчанию 10M подарков) против живой БД.
+
+Данные сидятся один раз пакетами generate_series на пользователя bench-search
+и переиспользуются при повторных запусках; --drop удаляет их в конце.
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from sqlalchemy import insert, select, text
+
+from bench import summarize
+from app.database.database import AsyncSessionLocal, engine
+from app.models.present import Present
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.repositories.search_repo import SearchRepository
+
+BENCH_USER = "bench-search"
+QUERIES = ["lamp", "red book", "blu", "chair 4242", "кружка", "gift card", "velvet"]
+SEED_BATCH = 1_000_000
+
+
+async def seed(rows: int) -> int:
+    async with AsyncSessionLocal() as session:
+        user_id = await session.scalar(select(User.id).where(User.username == BENCH_USER))
+        if user_id is None:
+            user_id = await session.scalar(
+                insert(User)
+                .values(username=BENCH_USER, email=f"{BENCH_USER}@example.com", hashed_password="x")
+                .returning(User.id)
+            )
+            await session.scalar(insert(Wishlist).values(name="bench search", user_id=user_id).returning(Wishlist.id))
+            await session.commit()
+        wishlist_id = await session.scalar(select(Wishlist.id).where(Wishlist.user_id == user_id))
+        existing = await session.scalar(select(Present.id).where(Present.wishlist_id == wishlist_id).limit(1).offset(rows - 1))
+        if existing is not None:
+            return user_id
+
+        await session.execute(text("DELETE FROM presents WHERE wishlist_id = :w"), {"w": wishlist_id})
+        for start in range(0, rows, SEED_BATCH):
+            started = time.perf_counter()
+            await session.execute(
+                text(
+                    "INSERT INTO presents (url, name, price, description, wishlist_id, created_at, updated_at) "
+                    "SELECT 'https://shop.example.com/item/' || i, "
+                    "(ARRAY['red','blue','green','velvet','wooden','silver','кожаный','gift'])[1 + i % 8] || ' ' || "
+                    "(ARRAY['lamp','book','chair','mug','кружка','card','scarf','watch','bag'])[1 + (i / 8) % 9] || ' ' || i, "
+                    "i % 5000, 'seeded for search benchmark', :w, LOCALTIMESTAMP, LOCALTIMESTAMP "
+                    "FROM generate_series(:start, :stop) AS i"
+                ),
+                {"w": wishlist_id, "start": start + 1, "stop": min(start + SEED_BATCH, rows)},
+            )
+            await session.commit()
+            print(f"seeded {min(start + SEED_BATCH, rows):,} rows ({time.perf_counter() - started:.1f}s)")
+        await session.execute(text("ANALYZE presents"))
+        await session.commit()
+        return user_id
+
+
+async def run(rows: int, repeats: int, limit: int, drop: bool) -> None:
+    try:
+        user_id = await seed(rows)
+        async with AsyncSessionLocal() as session:
+            repo = SearchRepository(session)
+            for query in QUERIES:
+                first_page: List[float] = []
+                next_page: List[float] = []
+                for _ in range(repeats):
+                    started = time.perf_counter()
+                    hits = await repo.search(user_id, query, limit + 1)
+                    first_page.append(time.perf_counter() - started)
+                    if len(hits) > limit:
+                        last = hits[limit - 1]
+                        started = time.perf_counter()
+                        await repo.search(user_id, query, limit + 1, (last.rank, last.kind, last.id))
+                        next_page.append(time.perf_counter() - started)
+                summarize(f"q={query!r} page 1", first_page)
+                if next_page:
+                    summarize(f"q={query!r} page 2", next_page)
+        if drop:
+            async with AsyncSessionLocal() as session:
+                await session.execute(text("DELETE FROM users WHERE username = :u"), {"u": BENCH_USER})
+                await session.commit()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--drop", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeats, args.limit, args.drop))
+
+
+if __name__ == "__main__":
+    main()
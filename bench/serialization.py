@@ -0,0 +1,69 @@
+"""Сериализация страницы подарков, мкс на строку: старый путь против construct_rows + ModelJSONResponse.
+
+Старый путь повторяет то, что делали сервис и FastAPI: model_validate на каждый
+ORM-объект, затем model_dump, повторная валидация по response_model и json.dumps.
+"""
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import ModelJSONResponse, construct_rows
+from app.schemas.present import PresentPage, PresentResponse
+
+Row = namedtuple("Row", "id url name price description wishlist_id created_at")
+
+
+def make_rows(count: int):
+    now = datetime.now()
+    rows = [
+        Row(i, f"https://example.com/{i}", f"Present {i}", float(i % 1000) + 0.99, "description", 1, now + timedelta(seconds=i))
+        for i in range(count)
+    ]
+    # ORM-объект отдаёт price как Decimal из Numeric(10, 2)
+    objects = [SimpleNamespace(**row._asdict(), updated_at=row.created_at) for row in rows]
+    for obj in objects:
+        obj.price = Decimal(str(obj.price))
+    return rows, objects
+
+
+def old_path(objects, adapter: TypeAdapter) -> bytes:
+    page = PresentPage(items=[PresentResponse.model_validate(obj) for obj in objects], next_cursor=None)
+    validated = adapter.validate_python(page.model_dump())
+    return json.dumps(adapter.dump_python(validated, mode="json"), separators=(",", ":")).encode()
+
+
+def new_path(rows) -> bytes:
+    page = PresentPage.model_construct(items=construct_rows(PresentResponse, rows), next_cursor=None)
+    return ModelJSONResponse(page).body
+
+
+def measure(name: str, func, rows: int, repeats: int) -> None:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:<34} {best * 1000:8.2f} ms/page  {best / rows * 1e6:6.2f} µs/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    rows, objects = make_rows(args.rows)
+    adapter = TypeAdapter(PresentPage)
+    assert json.loads(old_path(objects, adapter)) == json.loads(new_path(rows))
+    measure("model_validate + revalidation", lambda: old_path(objects, adapter), args.rows, args.repeats)
+    measure("construct_rows + ModelJSONResponse", lambda: new_path(rows), args.rows, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Писем в секунду: новое SMTP-соединение на письмо против SMTPConnectionPool.
+
+Сервер — локальный aiosmtpd (pip install aiosmtpd), письма никуда не уходят.
+Без TLS и AUTH разница занижена: в проде каждое новое соединение ещё платит
+за STARTTLS и LOGIN.
+"""
+import argparse
+import smtplib
+
+from bench import throughput
+from app.tasks.smtp_pool import SMTPConnectionPool
+from app.tasks.tasks import build_email
+
+HOST = "127.0.0.1"
+
+
+class Sink:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 OK"
+
+
+def send_with_new_connection(port: int, msg) -> None:
+    # Так send_email_task работал до пула
+    with smtplib.SMTP(HOST, port, timeout=10) as smtp:
+        smtp.send_message(msg)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--max-messages", type=int, default=100)
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        raise SystemExit("aiosmtpd is required: pip install aiosmtpd")
+
+    controller = Controller(Sink(), hostname=HOST, port=args.port)
+    controller.start()
+    try:
+        msg = build_email("bench@example.com", "Bench", "Hello", from_email="noreply@example.com")
+        throughput("connection per email", lambda: send_with_new_connection(args.port, msg), args.emails)
+
+        pool = SMTPConnectionPool(
+            server=HOST, port=args.port, user=None, password=None, use_tls=False,
+            size=1, max_messages=args.max_messages, idle_check_seconds=30,
+        )
+        throughput("SMTPConnectionPool", lambda: pool.send_message(msg), args.emails)
+        pool.close()
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
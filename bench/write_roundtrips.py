@@ -0,0 +1,71 @@
+"""Round-trip-ы и задержка записей репозиториев против живой БД (DATABASE_URL, схема после alembic upgrade).
+
+Считаются SQL-выражения, отправленные драйверу, и COMMIT-ы на одну операцию.
+Создаёт временного пользователя и удаляет его (каскадом с данными) в конце.
+"""
+import argparse
+import asyncio
+import uuid
+from collections import Counter
+from typing import Dict, List
+
+from sqlalchemy import event
+
+from bench import summarize, timed
+from app.database.database import AsyncSessionLocal, engine
+from app.repositories.present_repo import PresentRepository
+from app.repositories.user_repo import UserRepository
+from app.repositories.wishlist_repo import WishlistRepository
+
+
+async def run(iterations: int) -> None:
+    round_trips: Counter = Counter()
+    current = {"op": None}
+
+    def on_statement(*_):
+        if current["op"]:
+            round_trips[current["op"]] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_statement)
+    event.listen(engine.sync_engine, "commit", on_statement)
+
+    samples: Dict[str, List[float]] = {"create": [], "update": [], "delete": []}
+    async with AsyncSessionLocal() as session:
+        suffix = uuid.uuid4().hex[:12]
+        user = await UserRepository(session).create_user(
+            {"username": f"bench-{suffix}", "email": f"bench-{suffix}@example.com", "hashed_password": "x"}
+        )
+        wishlist = await WishlistRepository(session).create_wishlist({"name": "bench", "user_id": user.id})
+        presents = PresentRepository(session)
+        try:
+            for i in range(iterations):
+                current["op"] = "create"
+                with timed(samples["create"]):
+                    present = await presents.create_present(
+                        {"url": f"https://example.com/{i}", "name": f"Present {i}", "wishlist_id": wishlist.id}
+                    )
+                current["op"] = "update"
+                with timed(samples["update"]):
+                    await presents.update_present(present.id, {"price": i})
+                current["op"] = "delete"
+                with timed(samples["delete"]):
+                    await presents.delete_present(present.id)
+                current["op"] = None
+        finally:
+            current["op"] = None
+            await UserRepository(session).delete_user(user.id)
+            await engine.dispose()
+
+    for op, durations in samples.items():
+        summarize(f"{op} ({round_trips[op] / iterations:.1f} round-trips)", durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
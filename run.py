@@ -1,9 +1,12 @@
+import argparse
+import importlib.util
 import os
 from urllib.parse import urlparse
 from pathlib import Path
 import asyncpg
 from asyncpg.exceptions import ConnectionDoesNotExistError
 import asyncio
+import signal
 import subprocess
 import sys
 from redis import Redis
@@ -126,33 +129,76 @@ def start_worker(redis_url: str, work_queue: str = "emails") -> subprocess.Popen
     # Windows: rq.exe, POSIX: rq
     candidate = python_bin_dir / ("rq.exe" if os.name == "nt" else "rq")
 
+    # --with-scheduler нужен для отложенных повторов отправки писем
+    worker_args = ["worker", "-u", redis_url, "-w", settings.rq_worker_class, "--with-scheduler", work_queue]
     if candidate.exists():
-        cmd = [str(candidate), "worker", "-u", redis_url, work_queue]
+        cmd = [str(candidate), *worker_args]
     else:
         # fallback: попробовать модуль CLI (rq.cli), затем просто 'rq' из PATH
-        cmd = [sys.executable, "-m", "rq.cli", "worker", "-u", redis_url, work_queue]
+        cmd = [sys.executable, "-m", "rq.cli", *worker_args]
 
     print("Starting rq worker:", " ".join(cmd))
     try:
         return subprocess.Popen(cmd, env=env, cwd=str(BASE_DIR))
     except FileNotFoundError:
         # последний резерват: попытаться вызвать rq из PATH
-        cmd2 = ["rq", "worker", "-u", redis_url, work_queue]
+        cmd2 = ["rq", *worker_args]
         print("Falling back to PATH command:", " ".join(cmd2))
         return subprocess.Popen(cmd2, env=env, cwd=str(BASE_DIR))
 
-def start_uvicorn() -> subprocess.Popen:
+def start_outbox_relay() -> subprocess.Popen:
     env = os.environ.copy()
     env["PYTHONPATH"] = str(BASE_DIR)
-    cmd = [
-        sys.executable, "-m", "uvicorn", "app.main:app",
-        "--host", "localhost", "--port", "8000",
-        "--reload", "--log-level", "info", "--access-log"
+    cmd = [sys.executable, "-m", "app.tasks.outbox_relay"]
+    print("Starting outbox relay:", " ".join(cmd))
+    return subprocess.Popen(cmd, env=env, cwd=str(BASE_DIR))
+
+def uvicorn_prod_args() -> list[str]:
+    workers = settings.server_workers or os.cpu_count() or 1
+    # uvloop и httptools не входят в зависимости, берём их только если установлены
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    args = [
+        "--host", settings.server_host, "--port", str(settings.server_port),
+        "--workers", str(workers),
+        "--loop", loop, "--http", http,
+        "--backlog", str(settings.server_backlog),
+        "--timeout-keep-alive", str(settings.server_keepalive_timeout),
+        "--timeout-graceful-shutdown", str(settings.server_graceful_timeout),
+        "--log-level", "info", "--no-access-log",
     ]
+    if settings.server_limit_max_requests:
+        args += ["--limit-max-requests", str(settings.server_limit_max_requests)]
+    return args
+
+def start_uvicorn(prod: bool = False) -> subprocess.Popen:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(BASE_DIR)
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app"]
+    if prod:
+        cmd += uvicorn_prod_args()
+    else:
+        cmd += [
+            "--host", "localhost", "--port", "8000",
+            "--reload", "--log-level", "info", "--access-log"
+        ]
     print("Starting uvicorn:", " ".join(cmd))
     return subprocess.Popen(cmd, env=env, cwd=str(BASE_DIR))
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Запуск WishList API")
+    parser.add_argument("--prod", action="store_true", help="несколько воркеров uvicorn без --reload")
+    parser.add_argument("--no-worker", action="store_true", help="не запускать RQ worker и outbox relay")
+    return parser.parse_args()
+
+def handle_sigterm(signum, frame) -> None:
+    # SIGTERM обрабатываем как Ctrl+C, чтобы дочерние процессы завершились штатно
+    raise KeyboardInterrupt
+
 def main() -> None:
+    args = parse_args()
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
     # 1) bootstrap DB + migrations
     asyncio.run(bootstrap())
 
@@ -166,16 +212,20 @@ def main() -> None:
         sys.exit(1)
 
     # 3) start worker and uvicorn
-    worker_proc = start_worker(redis_url)
-    uvicorn_proc = start_uvicorn()
+    worker_proc = None if args.no_worker else start_worker(redis_url)
+    relay_proc = None if args.no_worker else start_outbox_relay()
+    uvicorn_proc = start_uvicorn(prod=args.prod)
 
     try:
         # Прослушивание процессов; просто ждём, пока пользователь не нажмёт Ctrl+C
         while True:
             # проверяем живы ли процессы
-            if worker_proc.poll() is not None:
+            if worker_proc and worker_proc.poll() is not None:
                 print("RQ worker exited with code", worker_proc.returncode)
                 break
+            if relay_proc and relay_proc.poll() is not None:
+                print("Outbox relay exited with code", relay_proc.returncode)
+                break
             if uvicorn_proc.poll() is not None:
                 print("Uvicorn exited with code", uvicorn_proc.returncode)
                 break
@@ -183,12 +233,13 @@ def main() -> None:
     except KeyboardInterrupt:
         print("Shutdown requested, terminating child processes...")
     finally:
-        for proc, name in ((uvicorn_proc, "uvicorn"), (worker_proc, "rq worker")):
+        for proc, name in ((uvicorn_proc, "uvicorn"), (worker_proc, "rq worker"), (relay_proc, "outbox relay")):
             if proc and proc.poll() is None:
                 print(f"Terminating {name} (pid={proc.pid})...")
                 proc.terminate()
                 try:
-                    proc.wait(timeout=5)
+                    # uvicorn дожидается завершения активных запросов
+                    proc.wait(timeout=settings.server_graceful_timeout + 5)
                 except Exception:
                     print(f"Killing {name} (pid={proc.pid})...")
                     proc.kill()
@@ -0,0 +1,36 @@
+import asyncio
+import os
+
+import pytest
+
+# Тесты работают с настоящим PostgreSQL. settings читают окружение при импорте app,
+# поэтому URL подставляется до первого импорта
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ.pop("DATABASE_READ_URL", None)
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+@pytest.fixture
+def run_db():
+    """Запускает сценарий на чистой схеме; без TEST_DATABASE_URL тест пропускается."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.database.database import engine
+    from tests.db import reset_schema
+
+    def run(scenario):
+        async def main():
+            try:
+                await reset_schema()
+                return await scenario()
+            finally:
+                # asyncpg-соединения привязаны к циклу событий, а у каждого теста он свой
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.database.database import Base, engine
+from app.models.outbox import OutboxMessage  # noqa: F401
+from app.models.present import Present
+from app.models.user import User
+from app.models.wishlist import Wishlist
+
+
+async def reset_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed_wishlist(session: AsyncSession, presents: int = 0) -> Tuple[int, int]:
+    """Создаёт пользователя и вишлист с presents подарками, возвращает (user_id, wishlist_id)."""
+    user_id = await session.scalar(
+        insert(User)
+        .values(username="tester", email="tester@example.com", hashed_password="x")
+        .returning(User.id)
+    )
+    wishlist_id = await session.scalar(
+        insert(Wishlist).values(name="Birthday", user_id=user_id).returning(Wishlist.id)
+    )
+    if presents:
+        await session.execute(
+            insert(Present),
+            [
+                {"url": f"https://example.com/{i}", "name": f"Present {i}", "price": i, "wishlist_id": wishlist_id}
+                for i in range(presents)
+            ],
+        )
+    await session.commit()
+    return user_id, wishlist_id
+
+
+async def seed_presents_bulk(session: AsyncSession, wishlist_id: int, rows: int) -> None:
+    # generate_series на стороне БД: миллион строк без передачи через драйвер
+    await session.execute(
+        text(
+            "INSERT INTO presents (url, name, price, description, wishlist_id, created_at, updated_at) "
+            "SELECT 'https://example.com/' || i, 'Present ' || i, i % 1000, 'seeded', :wishlist_id, "
+            "LOCALTIMESTAMP, LOCALTIMESTAMP "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {"wishlist_id": wishlist_id, "rows": rows},
+    )
+    await session.commit()
+
+
+@contextmanager
+def count_queries(async_engine: AsyncEngine) -> Iterator[List[str]]:
+    """Собирает SQL, отправленный драйверу внутри блока."""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,46 @@
+import gc
+import json
+import os
+
+import pytest
+
+from app.database.database import AsyncSessionLocal
+from app.services.export import ExportService
+from tests.db import seed_presents_bulk, seed_wishlist
+
+# Миллион строк, как в задаче; EXPORT_TEST_ROWS позволяет уменьшить прогон локально
+EXPORT_TEST_ROWS = int(os.getenv("EXPORT_TEST_ROWS", 1_000_000))
+EXPORT_TEST_RSS_CEILING_MB = int(os.getenv("EXPORT_TEST_RSS_CEILING_MB", 64))
+STATM = "/proc/self/statm"
+
+
+def _rss_bytes() -> int:
+    with open(STATM) as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest.mark.skipif(not os.path.exists(STATM), reason="needs /proc to sample RSS")
+def test_ndjson_export_keeps_rss_under_ceiling(run_db):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            user_id, wishlist_id = await seed_wishlist(session)
+            await seed_presents_bulk(session, wishlist_id, EXPORT_TEST_ROWS)
+
+        gc.collect()
+        baseline = peak = _rss_bytes()
+        records = 0
+        last = b""
+        async for chunk in ExportService(user_id).stream_ndjson():
+            records += chunk.count(b"\n")
+            last = chunk
+            peak = max(peak, _rss_bytes())
+
+        # Вишлист + все подарки, последней строкой идёт подарок
+        assert records == EXPORT_TEST_ROWS + 1
+        assert json.loads(last.splitlines()[-1])["type"] == "present"
+        growth_mb = (peak - baseline) / 2 ** 20
+        assert growth_mb < EXPORT_TEST_RSS_CEILING_MB, (
+            f"RSS grew by {growth_mb:.1f} MB while exporting {EXPORT_TEST_ROWS} rows"
+        )
+
+    run_db(scenario)
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import text
+
+from app.database.database import AsyncSessionLocal, engine
+from app.main import app
+from app.models.user import RoleEnum
+from app.schemas.user import CurrentUser
+from app.security.dependencies import get_current_user
+from app.services.wishlist import WishlistService
+from tests.db import count_queries, seed_wishlist
+
+
+async def get_detail(user_id: int, wishlist_id: int, **headers: str):
+    httpx = pytest.importorskip("httpx")
+    # Токен не нужен: пользователь подставляется вместо JWT и запроса в users
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(id=user_id, role=RoleEnum.USER)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(f"/api/wishlist/{wishlist_id}", params={"include": "presents"}, headers=headers)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_detail_loads_wishlist_and_presents_in_one_query(run_db):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            _, wishlist_id = await seed_wishlist(session, presents=5)
+
+        async with AsyncSessionLocal() as session:
+            # Соединение уже взято и инициализировано: считаем только запросы сервиса
+            await session.execute(text("SELECT 1"))
+            with count_queries(engine) as statements:
+                detail = await WishlistService(session).get_wishlist_detail(wishlist_id)
+
+        assert len(statements) == 1, statements
+        assert detail.id == wishlist_id
+        assert [present.name for present in detail.presents] == [f"Present {i}" for i in range(5)]
+
+    run_db(scenario)
+
+
+def test_detail_of_empty_wishlist_is_one_query(run_db):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            _, wishlist_id = await seed_wishlist(session)
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"))
+            with count_queries(engine) as statements:
+                detail = await WishlistService(session).get_wishlist_detail(wishlist_id)
+
+        assert len(statements) == 1, statements
+        assert detail.presents == []
+
+    run_db(scenario)
+
+
+def test_detail_route_is_etag_plus_one_query(run_db):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            user_id, wishlist_id = await seed_wishlist(session, presents=5)
+
+        # Первое соединение пула инициализирует диалект: прогреваем, чтобы считать только роут
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        with count_queries(engine) as statements:
+            response = await get_detail(user_id, wishlist_id)
+
+        assert response.status_code == 200
+        assert len(statements) == 2, statements
+        assert response.headers["ETag"]
+        assert [present["name"] for present in response.json()["presents"]] == [f"Present {i}" for i in range(5)]
+
+    run_db(scenario)
+
+
+def test_detail_route_not_modified_is_one_query(run_db):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            user_id, wishlist_id = await seed_wishlist(session, presents=5)
+
+        etag = (await get_detail(user_id, wishlist_id)).headers["ETag"]
+        with count_queries(engine) as statements:
+            response = await get_detail(user_id, wishlist_id, **{"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert len(statements) == 1, statements
+
+    run_db(scenario)